@@ -1,21 +1,109 @@
 """
 Simplified AI Client - Direct LLM access
 """
+import asyncio
+import weakref
+from contextlib import aclosing
+from functools import lru_cache
+from typing import Any, List
+
+import httpx
+from openai import DefaultHttpxClient, DefaultAioHttpClient
 from langchain_openai import ChatOpenAI
-from app.core.config import settings
+from app.core.config import get_settings
+from app.core.utils import JsonObjectScanner
+
+# Environment is fixed for the life of the process
+_IS_DEV = get_settings().environment.lower() == "development"
+
+# One limiter per event loop: asyncio primitives bind to the loop that first uses them
+_llm_call_limits: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, asyncio.Semaphore]" = weakref.WeakKeyDictionary()
+
+def llm_call_limit() -> asyncio.Semaphore:
+    """Semaphore capping concurrent OpenAI calls on the running loop; hold it around each call"""
+    loop = asyncio.get_running_loop()
+    limit = _llm_call_limits.get(loop)
+    if limit is None:
+        limit = asyncio.Semaphore(get_settings().openai_max_concurrent)
+        _llm_call_limits[loop] = limit
+    return limit
+
+async def astream_json_object(llm: Any, messages: List[Any]) -> str:
+    """Stream a JSON-mode completion and stop reading as soon as its top-level object closes.
+    
+    Holds an llm_call_limit() slot for the duration of the call.
+    """
+    scanner = JsonObjectScanner()
+    chunks = []
+    # aclosing: stopping early closes the stream now (releasing the HTTP response and running
+    # the end-of-call callbacks) rather than whenever the generator is garbage-collected
+    async with llm_call_limit(), aclosing(llm.astream(messages)) as stream:
+        async for chunk in stream:
+            chunks.append(chunk.content)
+            if scanner.feed(chunk.content):
+                break
+    return "".join(chunks)
+
+@lru_cache(maxsize=1)
+def _shared_http_clients() -> tuple[httpx.Client, httpx.AsyncClient]:
+    """HTTP clients shared by every ChatOpenAI in the process.
 
-# Singleton instance for mock LLM to maintain call counter
-_mock_llm_instance = None
+    Sync calls use an HTTP/2 httpx client. Async calls, which is where the
+    agents fan out concurrently, go through the SDK's aiohttp transport, which
+    holds up better than httpx's pool under concurrent load. Its aiohttp
+    session is opened lazily on the loop that first uses it, which is the
+    server loop or the worker's persistent loop.
+    """
+    return (
+        DefaultHttpxClient(
+            http2=True,
+            limits=httpx.Limits(max_connections=200, max_keepalive_connections=50)
+        ),
+        DefaultAioHttpClient(
+            limits=httpx.Limits(max_connections=64, max_keepalive_connections=32, keepalive_expiry=75)
+        )
+    )
+
+async def close_llm_http_clients():
+    """Close the shared LLM HTTP clients (application shutdown)"""
+    if _shared_http_clients.cache_info().currsize == 0:
+        return
+    http_client, http_async_client = _shared_http_clients()
+    await http_async_client.aclose()
+    http_client.close()
+    _shared_http_clients.cache_clear()
+    _build_real_llm.cache_clear()
+
+@lru_cache(maxsize=8)
+def _build_real_llm(model: str, api_key: str, temperature: float) -> ChatOpenAI:
+    """Build one ChatOpenAI per (model, api_key, temperature) on the shared HTTP clients.
+
+    Every agent prompt asks for a single JSON object, so JSON mode is always on:
+    responses arrive as bare JSON, without code fences or surrounding prose.
+
+    Call ``_build_real_llm.cache_clear()`` after rotating API keys.
+    """
+    http_client, http_async_client = _shared_http_clients()
+    return ChatOpenAI(
+        model=model,
+        api_key=api_key,
+        temperature=temperature,
+        http_client=http_client,
+        http_async_client=http_async_client,
+        model_kwargs={"response_format": {"type": "json_object"}}
+    )
+
+@lru_cache(maxsize=1)
+def _mock_llm(model: str, api_key: str, temperature: float):
+    """Build the mock LLM once so its call counter is shared across agents"""
+    from app.mocks.mock_llm import MockChatOpenAI
+    return MockChatOpenAI(model=model, api_key=api_key, temperature=temperature)
 
 def get_llm_client(api_key: str, model: str = "gpt-4o-mini", temperature: float = 0.1):
     """Get LLM client (real or mock based on environment)"""
     # Use mocks if environment=development
-    if settings.environment.lower() == 'development':
-        global _mock_llm_instance
-        if _mock_llm_instance is None:
-            from app.mocks.mock_llm import MockChatOpenAI
-            _mock_llm_instance = MockChatOpenAI(model=model, api_key=api_key, temperature=temperature)
-        return _mock_llm_instance
-    
-    # Use real LLM
-    return ChatOpenAI(model=model, api_key=api_key, temperature=temperature)
+    if _IS_DEV:
+        return _mock_llm(model, api_key, temperature)
+
+    # Use real LLM (memoized)
+    return _build_real_llm(model, api_key, temperature)
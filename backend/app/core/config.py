@@ -1,11 +1,19 @@
 import os
+import sys
 import logging
+import queue
+import atexit
+import threading
+from logging.handlers import QueueHandler, QueueListener
+from functools import lru_cache
 from typing import Optional
 from pydantic_settings import BaseSettings
 from dotenv import load_dotenv
 
-# Load environment variables from .env file
-load_dotenv()
+# Load environment variables from .env file (once per process, only if present)
+if not os.environ.get("_ENV_LOADED") and os.path.exists(".env"):
+    load_dotenv(override=False)
+    os.environ["_ENV_LOADED"] = "1"
 
 class Settings(BaseSettings):
     # Environment
@@ -26,6 +34,23 @@ class Settings(BaseSettings):
     api_host: str = "0.0.0.0"
     port: int = 8000  # Using PORT to match your .env file
     
+    # PostgreSQL connection pool, per engine (each process has an async and/or a sync engine)
+    postgres_pool_size: int = 10
+    postgres_max_overflow: int = 20
+    postgres_pool_timeout: int = 30      # seconds to wait for a free connection
+    postgres_pool_recycle: int = 1800    # seconds before a connection is replaced
+    # Ping each connection on checkout (one extra round trip); needed wherever the server drops
+    # idle connections before pool_recycle, e.g. Neon suspending idle compute
+    postgres_pool_pre_ping: bool = True
+    # Open pool_size connections at startup so early requests skip the TCP/TLS/auth handshake
+    postgres_prewarm: bool = False
+    
+    # Max OpenAI calls in flight per event loop (excess calls queue instead of tripping rate limits)
+    openai_max_concurrent: int = 20
+    
+    # Analyze market, competitor and customer data in one LLM call (false: one call per agent)
+    combined_analysis_enabled: bool = True
+    
     # Celery Configuration
     celery_broker_url: str = ""
     celery_result_backend: str = ""
@@ -39,73 +64,122 @@ class Settings(BaseSettings):
         env_file = ".env"
         extra = "ignore"
 
-# Create global settings instance
-settings = Settings()
+@lru_cache(maxsize=1)
+def get_settings() -> Settings:
+    """Build settings once per process and reuse the cached instance"""
+    settings = Settings()
+    
+    # Initialize Celery-specific URLs from main database URLs if not explicitly set
+    if not settings.celery_broker_url:
+        settings.celery_broker_url = settings.redis_url
+    if not settings.celery_result_backend:
+        # Use Redis for results backend (more reliable than PostgreSQL)
+        settings.celery_result_backend = settings.redis_url
+    return settings
+
+# Process-wide logging parameters (invariant for the lifetime of the process)
+_IS_CELERY = any(('celery' in arg) or ('worker' in arg) for arg in sys.argv)
+_LOG_LEVEL_INT = getattr(logging, get_settings().log_level.upper(), logging.INFO)
+_LOG_FORMAT = '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
+
+def _resolve_log_file_path() -> Optional[str]:
+    """Resolve the process-specific log file path (None means log to stdout)"""
+    # Determine log file based on process type
+    log_file = get_settings().celery_log_file if _IS_CELERY else get_settings().log_file
+    if not (log_file and log_file.strip()):
+        return None
+    
+    # Ensure log file path is absolute or in a writable directory
+    if not os.path.isabs(log_file):
+        # If relative path, use current working directory
+        log_file = os.path.join(os.getcwd(), log_file)
+    os.makedirs(os.path.dirname(log_file), exist_ok=True)
+    return log_file
+
+_LOG_FILE_PATH = _resolve_log_file_path()
+
+# Handlers shared by every logger (one file descriptor per process)
+_handler_lock = threading.Lock()
+_shared_handlers: dict = {}
+
+def _shared_handler(kind: str) -> logging.Handler:
+    """Build the shared 'file' or 'console' handler on first use"""
+    handler = _shared_handlers.get(kind)
+    if handler is not None:
+        return handler
+    
+    with _handler_lock:
+        handler = _shared_handlers.get(kind)
+        if handler is None:
+            if kind == "file" and _LOG_FILE_PATH:
+                handler = logging.FileHandler(_LOG_FILE_PATH)
+            else:
+                # Default to stdout if no log file specified
+                handler = logging.StreamHandler()
+            handler.setLevel(_LOG_LEVEL_INT)
+            handler.setFormatter(logging.Formatter(_LOG_FORMAT))
+            
+            if kind == "file":
+                handler = _start_queue_listener(handler)
+            _shared_handlers[kind] = handler
+    return handler
+
+_queue_listener: Optional[QueueListener] = None
+
+def _start_queue_listener(target: logging.Handler) -> logging.Handler:
+    """Move blocking file writes to a background thread; loggers only enqueue records"""
+    queue_handler = QueueHandler(queue.Queue(-1))
+    queue_handler.setLevel(_LOG_LEVEL_INT)
+    _run_queue_listener(queue_handler.queue, target)
+    
+    # Threads do not survive fork (Celery's prefork pool): each child gets its own queue and listener
+    if hasattr(os, "register_at_fork"):
+        os.register_at_fork(after_in_child=lambda: _restart_queue_listener(queue_handler, target))
+    atexit.register(stop_queue_listener)
+    return queue_handler
+
+def _run_queue_listener(log_queue: queue.Queue, target: logging.Handler) -> None:
+    global _queue_listener
+    _queue_listener = QueueListener(log_queue, target, respect_handler_level=True)
+    _queue_listener.start()
 
-# Initialize Celery-specific URLs from main database URLs if not explicitly set
-if not settings.celery_broker_url:
-    settings.celery_broker_url = settings.redis_url
-if not settings.celery_result_backend:
-    # Use Redis for results backend (more reliable than PostgreSQL)
-    settings.celery_result_backend = settings.redis_url
+def _restart_queue_listener(queue_handler: QueueHandler, target: logging.Handler) -> None:
+    """Replace the parent's queue (which has no consumer in this process) and start a listener for it"""
+    queue_handler.queue = queue.Queue(-1)
+    _run_queue_listener(queue_handler.queue, target)
+
+def stop_queue_listener() -> None:
+    """Write out queued records and stop this process's listener thread (safe to call twice)"""
+    global _queue_listener
+    listener, _queue_listener = _queue_listener, None
+    if listener is not None:
+        listener.stop()
 
 def get_logger(name: str) -> logging.Logger:
     logger = logging.getLogger(name)
     if not logger.handlers:
-        # Determine log file based on process type
-        import sys
-        if 'celery' in sys.argv or 'worker' in sys.argv:
-            # Celery worker process
-            log_file = settings.celery_log_file
-        else:
-            # Backend server process
-            log_file = settings.log_file
-        
-        # Create file handler with process-specific log file
-        if log_file and log_file.strip():
-            # Ensure log file path is absolute or in a writable directory
-            if not os.path.isabs(log_file):
-                # If relative path, use current working directory
-                log_file = os.path.join(os.getcwd(), log_file)
-            file_handler = logging.FileHandler(log_file)
-        else:
-            # Default to stdout if no log file specified
-            file_handler = logging.StreamHandler()
-        file_handler.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
-        
-        # Create formatter
-        formatter = logging.Formatter(
-            '%(asctime)s - %(name)s - %(levelname)s - %(message)s'
-        )
-        
-        # Add formatter to file handler
-        file_handler.setFormatter(formatter)
-        
-        # Add file handler to logger
-        logger.addHandler(file_handler)
+        # Attach the shared process-specific file handler
+        logger.addHandler(_shared_handler("file"))
         
         # Only add console handler for backend server (not Celery workers)
-        if not (any('celery' in arg for arg in sys.argv) or any('worker' in arg for arg in sys.argv)):
-            console_handler = logging.StreamHandler()
-            console_handler.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
-            console_handler.setFormatter(formatter)
-            logger.addHandler(console_handler)
+        if not _IS_CELERY:
+            logger.addHandler(_shared_handler("console"))
         
-        logger.setLevel(getattr(logging, settings.log_level.upper(), logging.INFO))
+        logger.setLevel(_LOG_LEVEL_INT)
     return logger
 
 # Convenience functions for backward compatibility
 def get_database_url() -> str:
-    return settings.postgres_url
+    return get_settings().postgres_url
 
 def get_mongodb_url() -> str:
-    return settings.mongodb_url
+    return get_settings().mongodb_url
 
 def get_redis_url() -> str:
-    return settings.redis_url
+    return get_settings().redis_url
 
 def get_openai_api_key() -> str:
-    return settings.openai_api_key
+    return get_settings().openai_api_key
 
 def get_tavily_api_key() -> str:
-    return settings.tavily_api_key
+    return get_settings().tavily_api_key
@@ -3,7 +3,7 @@ Constants used across the application
 """
 
 # All checkpoints in the research workflow
-ALL_CHECKPOINTS = [
+ALL_CHECKPOINTS = (
     "research_plan_created",
     "queries_generated", 
     "market_search_started",
@@ -21,9 +21,30 @@ ALL_CHECKPOINTS = [
     "report_generation_started",
     "report_generation_completed",
     "final_report_delivered"
-]
+)
 
 TOTAL_CHECKPOINTS = len(ALL_CHECKPOINTS)
 
+# O(1) membership test and position lookup for checkpoint names
+CHECKPOINT_SET = frozenset(ALL_CHECKPOINTS)
+CHECKPOINT_INDEX = {name: index for index, name in enumerate(ALL_CHECKPOINTS)}
+
 # OpenAI API limits
 MAX_CHARACTERS_PER_REQUEST = 320000  # Conservative estimate: 1 token ≈ 3.5 characters, 96k * 3.5 = 336k, use 320k for safety
+
+
+# Tavily extraction parameters per research depth: (number of URLs to extract, extract_depth)
+EXTRACTION_PARAMS_BY_DEPTH = {
+    "basic": (5, "basic"),
+    "standard": (5, "advanced"),
+    "comprehensive": (10, "advanced")
+}
+
+# Upper bound for one agent's Tavily search + extract; matches the two calls' own HTTP timeouts (30s + 60s)
+SOURCE_FETCH_TIMEOUT_SECONDS = 90
+
+# Most product ideas accepted by one batch research submission
+MAX_RESEARCH_BATCH_SIZE = 20
+
+# How long an exact-prompt LLM response stays cached in Redis
+LLM_CACHE_TTL_SECONDS = 24 * 3600
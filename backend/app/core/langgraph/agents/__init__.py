@@ -1,11 +1,15 @@
+from .base_agent import BaseInsightAgent
 from .market_agent import MarketAnalysisAgent
 from .competitor_agent import CompetitorAnalysisAgent
 from .customer_agent import CustomerInsightsAgent
 from .report_agent import ReportGenerationAgent
+from .combined_agent import CombinedAnalysisAgent
 
 __all__ = [
+    'BaseInsightAgent',
     'MarketAnalysisAgent',
     'CompetitorAnalysisAgent', 
     'CustomerInsightsAgent',
-    'ReportGenerationAgent'
+    'ReportGenerationAgent',
+    'CombinedAnalysisAgent'
 ]
@@ -0,0 +1,17 @@
+"""
+Shared helpers for the data analysis agents
+"""
+from typing import Dict, Any, List
+
+from app.core.constants import EXTRACTION_PARAMS_BY_DEPTH
+
+
+def determine_extraction_params(
+    search_results: List[Dict[str, Any]],
+    research_depth: str
+) -> tuple[List[str], str]:
+    # Unknown depths fall back to comprehensive, matching the original else-branch
+    url_count, depth = EXTRACTION_PARAMS_BY_DEPTH.get(
+        research_depth, EXTRACTION_PARAMS_BY_DEPTH["comprehensive"]
+    )
+    return [result["url"] for result in search_results[:url_count]], depth
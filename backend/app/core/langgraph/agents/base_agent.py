@@ -0,0 +1,228 @@
+from typing import Dict, Any, List, Optional, Callable, Mapping
+
+import asyncio
+import copy
+from abc import ABC, abstractmethod
+
+import orjson
+
+from app.utils.api_tracker import SimpleTavilyClient
+from app.core.utils import (
+    now_iso, load_json_from_response, serialize_search_results_for_llm, run_json_task
+)
+from app.core.config import get_logger
+from app.core.ai_client import get_llm_client
+from app.core.constants import SOURCE_FETCH_TIMEOUT_SECONDS
+from app.services.llm_cache import llm_response_cache
+from app.services.progress_tracker import progress_tracker
+from ._common import determine_extraction_params
+
+logger = get_logger(__name__)
+
+class BaseInsightAgent(ABC):
+    """Search -> extract -> analyze pipeline shared by the data analysis agents.
+    
+    Subclasses configure the class attributes below and implement _error_fields
+    (how the error message is placed into their error analysis).
+    """
+    
+    __slots__ = ("llm", "tavily_api_key")
+    
+    AGENT_NAME: str = ""
+    # (search_started, search_completed, extraction_completed, analysis_completed)
+    CHECKPOINTS: tuple[str, str, str, str] = ("", "", "", "")
+    SOURCES_COUNT_KEY: str = ""
+    ANALYSIS_METHOD: str = ""
+    # (product_idea, sector, data) -> (system_prompt, human_prompt)
+    PROMPT_FORMATTER: Callable[[str, str, str], tuple[str, str]]
+    # Static part of the error analysis; only the error message field is filled per call
+    ERROR_ANALYSIS_TEMPLATE: Mapping[str, Any] = {}
+    
+    def __init__(self, openai_api_key: str, tavily_api_key: str, llm: Optional[Any] = None):
+        self.llm = llm or get_llm_client(openai_api_key)
+        self.tavily_api_key = tavily_api_key
+    
+    async def analyze(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        request_id: str = "unknown"
+    ) -> Dict[str, Any]:
+        search_results = await self.fetch_sources(query, context, request_id)
+        return await self.analyze_sources(query, context, search_results, request_id)
+    
+    async def fetch_sources(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        request_id: str = "unknown",
+        timeout: float = SOURCE_FETCH_TIMEOUT_SECONDS
+    ) -> List[Dict[str, Any]]:
+        """Search and extract sources for the query; a fetch that times out yields no sources"""
+        try:
+            return await asyncio.wait_for(self._search_data(query, context, request_id), timeout)
+        except asyncio.TimeoutError:
+            logger.error("[%s] %s: Search timed out after %ss", request_id, self.AGENT_NAME, timeout)
+            return []
+    
+    async def analyze_sources(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        search_results: List[Dict[str, Any]],
+        request_id: str = "unknown"
+    ) -> Dict[str, Any]:
+        """Analyze already fetched sources into the agent's result"""
+        try:
+            analysis, analysis_json = await self._analyze_data(context, search_results, request_id)
+            return self._build_result(query, context, search_results, analysis, analysis_json)
+        
+        except Exception as e:
+            logger.error("[%s] %s: Analysis failed - %s", request_id, self.AGENT_NAME, e)
+            return self._create_error_result(context, str(e))
+    
+    def _build_result(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        search_results: List[Dict[str, Any]],
+        analysis: Dict[str, Any],
+        analysis_json: Optional[str]
+    ) -> Dict[str, Any]:
+        return {
+            "agent_name": self.AGENT_NAME,
+            "status": "success",
+            "analysis": analysis,
+            "analysis_json": analysis_json,
+            "sources_analyzed": len(search_results),
+            "data_sources": {
+                self.SOURCES_COUNT_KEY: len(search_results),
+                "source_urls": [result.get("url", "") for result in search_results[:10]],
+                "search_query": query,
+                "analysis_method": self.ANALYSIS_METHOD
+            },
+            "timestamp": now_iso(),
+            "context": {
+                "sector": context.get("sector", ""),
+                "product_idea": context.get("product_idea", ""),
+                "research_depth": context.get("research_depth", "standard")
+            }
+        }
+    
+    async def _search_data(
+        self,
+        query: str,
+        context: Dict[str, Any],
+        request_id: str
+    ) -> List[Dict[str, Any]]:
+        search_started, search_completed, extraction_completed, _ = self.CHECKPOINTS
+        try:
+            tavily_client = SimpleTavilyClient(request_id)
+            
+            research_depth = context.get("research_depth", "standard")
+            max_sources = context.get("max_sources", 20)
+            
+            search_depth = "advanced" if research_depth in ["standard", "comprehensive"] else "basic"
+            
+            # Checkpoint: Search started
+            await progress_tracker.acomplete_checkpoint(request_id, search_started)
+            
+            search_response = await tavily_client.asearch(
+                query=query,
+                search_depth=search_depth,
+                max_results=max_sources,
+                include_answer=True,
+                include_raw_content=False
+            )
+            
+            search_results = search_response.get("results", [])
+            
+            # Only record checkpoint if search was successful
+            if search_results:
+                await progress_tracker.acomplete_checkpoint(request_id, search_completed)
+            
+            urls_to_extract, extract_depth = determine_extraction_params(
+                search_results, research_depth
+            )
+            
+            if urls_to_extract:
+                extract_response = await tavily_client.aextract(
+                    urls=urls_to_extract,
+                    extract_depth=extract_depth
+                )
+                extracted_data = extract_response.get("results", [])
+                
+                # Only record checkpoint if extraction was successful
+                if extracted_data:
+                    await progress_tracker.acomplete_checkpoint(request_id, extraction_completed)
+                
+                for result, extracted in zip(search_results, extracted_data):
+                    result["extracted_content"] = extracted.get("raw_content", "")
+            
+            return search_results
+        
+        except Exception as e:
+            logger.error("[%s] %s: Search failed - %s", request_id, self.AGENT_NAME, e)
+            return []
+    
+    async def _analyze_data(
+        self,
+        context: Dict[str, Any],
+        search_results: List[Dict[str, Any]],
+        request_id: str
+    ) -> tuple[Dict[str, Any], Optional[str]]:
+        """Return the parsed analysis and the JSON text it came from (None on error)"""
+        try:
+            product_idea = context.get("product_idea", "")
+            sector = context.get("sector", "")
+            
+            # Truncate and serialize search results to fit within token limits
+            data = await run_json_task(serialize_search_results_for_llm, search_results)
+            
+            system_prompt, human_prompt = self.PROMPT_FORMATTER(product_idea, sector, data)
+            
+            # Identical prompts (same idea, sector and source texts) reuse the cached analysis
+            analysis, json_content = await llm_response_cache.ainvoke_parsed(
+                self.llm, self.AGENT_NAME, system_prompt, human_prompt, load_json_from_response, request_id
+            )
+            
+            # Only record checkpoint if analysis was successful
+            if analysis and not analysis.get("error"):
+                await progress_tracker.acomplete_checkpoint(request_id, self.CHECKPOINTS[3])
+            
+            return analysis, json_content
+        
+        except orjson.JSONDecodeError as e:
+            logger.error("[%s] %s: JSON parsing failed - %s", request_id, self.AGENT_NAME, e)
+            return self._create_error_analysis(f"JSON parsing error: {str(e)}"), None
+        
+        except Exception as e:
+            logger.error("[%s] %s: Analysis failed - %s", request_id, self.AGENT_NAME, e)
+            return self._create_error_analysis(str(e)), None
+    
+    @abstractmethod
+    def _error_fields(self, error_msg: str) -> Dict[str, Any]:
+        """Fields of the error analysis that carry the error message"""
+    
+    def _create_error_analysis(self, error_msg: str) -> Dict[str, Any]:
+        # Deep copy: the template's nested dicts and lists must not be shared between results
+        analysis = copy.deepcopy(dict(self.ERROR_ANALYSIS_TEMPLATE))
+        analysis.update(self._error_fields(error_msg))
+        return analysis
+    
+    def _create_error_result(self, context: Dict[str, Any], error_msg: str) -> Dict[str, Any]:
+        return {
+            "agent_name": self.AGENT_NAME,
+            "status": "error",
+            "error": error_msg,
+            "analysis": self._create_error_analysis(error_msg),
+            "sources_analyzed": 0,
+            "data_sources": {
+                self.SOURCES_COUNT_KEY: 0,
+                "source_urls": [],
+                "search_query": "",
+                "analysis_method": "Error occurred"
+            },
+            "timestamp": now_iso(),
+            "context": context
+        }
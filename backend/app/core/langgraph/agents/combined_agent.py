@@ -0,0 +1,109 @@
+import asyncio
+from typing import Dict, Any, List, Mapping, Optional
+
+from app.core.constants import MAX_CHARACTERS_PER_REQUEST
+from app.core.prompts import format_combined_analyzer_prompt
+from app.core.utils import load_json_from_response, serialize_search_results_for_llm, run_json_task
+from app.core.config import get_logger
+from app.services.llm_cache import llm_response_cache
+from app.services.progress_tracker import progress_tracker
+from .base_agent import BaseInsightAgent
+
+logger = get_logger(__name__)
+
+def _parse_sections(content: str) -> Dict[str, Any]:
+    """Per-agent sections of a combined analysis response"""
+    sections, _ = load_json_from_response(content)
+    if not isinstance(sections, dict):
+        raise ValueError("Combined analysis response is not a JSON object")
+    return sections
+
+class CombinedAnalysisAgent:
+    """Runs the insight agents' searches in parallel and analyzes all their data in one LLM call.
+    
+    Each agent's result keeps the shape produced by BaseInsightAgent.analyze. An agent whose
+    section is missing from the combined response falls back to its own analysis call.
+    """
+    
+    __slots__ = ("llm", "agents")
+    
+    def __init__(self, agents: Mapping[str, BaseInsightAgent], llm: Any):
+        # Keyed by the section name used in the combined response ("market", "competitor", "customer")
+        self.agents = agents
+        self.llm = llm
+    
+    async def analyze(
+        self,
+        queries: Dict[str, str],
+        context: Dict[str, Any],
+        request_id: str = "unknown"
+    ) -> Dict[str, Dict[str, Any]]:
+        names = tuple(self.agents)
+        # Each fetch has its own timeout, so one slow search cannot hold up the others past it
+        search_results = await asyncio.gather(*(
+            self.agents[name].fetch_sources(queries[name], context, request_id) for name in names
+        ), return_exceptions=True)
+        sources = {
+            name: [] if isinstance(results, BaseException) else results
+            for name, results in zip(names, search_results)
+        }
+        
+        try:
+            sections = await self._analyze_combined(context, sources, request_id)
+        except Exception as e:
+            logger.warning("[%s] Combined analysis failed, falling back to per-agent analysis - %s", request_id, e)
+            sections = {}
+        
+        results = await asyncio.gather(*(
+            self._finish_agent(name, queries[name], context, sources[name], sections.get(name), request_id)
+            for name in names
+        ))
+        return dict(zip(names, results))
+    
+    async def _analyze_combined(
+        self,
+        context: Dict[str, Any],
+        sources: Dict[str, List[Dict[str, Any]]],
+        request_id: str
+    ) -> Dict[str, Any]:
+        # The three datasets share one request, so each gets an equal share of the size budget
+        max_chars = MAX_CHARACTERS_PER_REQUEST // len(sources)
+        market_data, competitor_data, customer_data = await asyncio.gather(*(
+            run_json_task(serialize_search_results_for_llm, sources[name], max_chars)
+            for name in ("market", "competitor", "customer")
+        ))
+        
+        system_prompt, human_prompt = format_combined_analyzer_prompt(
+            context.get("product_idea", ""),
+            context.get("sector", ""),
+            market_data,
+            competitor_data,
+            customer_data
+        )
+        
+        return await llm_response_cache.ainvoke_parsed(
+            self.llm, "CombinedAnalysisAgent", system_prompt, human_prompt, _parse_sections, request_id
+        )
+    
+    async def _finish_agent(
+        self,
+        name: str,
+        query: str,
+        context: Dict[str, Any],
+        search_results: List[Dict[str, Any]],
+        section: Optional[Any],
+        request_id: str
+    ) -> Dict[str, Any]:
+        agent = self.agents[name]
+        if not isinstance(section, dict):
+            return await agent.analyze_sources(query, context, search_results, request_id)
+        
+        try:
+            # Only record checkpoint if analysis was successful
+            if section and not section.get("error"):
+                await progress_tracker.acomplete_checkpoint(request_id, agent.CHECKPOINTS[3])
+            return agent._build_result(query, context, search_results, section, None)
+        
+        except Exception as e:
+            logger.error("[%s] %s: Analysis failed - %s", request_id, agent.AGENT_NAME, e)
+            return agent._create_error_result(context, str(e))
@@ -1,21 +1,88 @@
-import json
+import asyncio
+import copy
 from typing import Dict, Any, List, Optional
-from datetime import datetime
+from types import MappingProxyType
 
+import orjson
 from langchain_openai import ChatOpenAI
-from langchain_core.messages import HumanMessage, SystemMessage
 
-from app.core.utils import extract_json_from_response
+from app.core.utils import now_iso, parse_json_response, run_json_task, dedupe_citations
 from app.core.prompts import format_report_generator_prompt
 from app.core.config import get_logger
+from app.core.ai_client import get_llm_client
+from app.services.llm_cache import llm_response_cache
 
 logger = get_logger(__name__)
 
-class ReportGenerationAgent:
+def _dumps(obj: Any) -> str:
+    """Pretty-print an analysis for the report prompt"""
+    return orjson.dumps(obj, option=orjson.OPT_INDENT_2).decode()
+
+# Static part of the error report; only the executive summary is filled per call
+_ERROR_REPORT_TEMPLATE = MappingProxyType({
+    "market_insights": {
+        "market_size": "See raw analysis", 
+        "growth_rate": "Error", 
+        "key_trends": [], 
+        "market_drivers": [], 
+        "future_outlook": ""
+    },
+    "competitive_landscape": {
+        "competitive_landscape": "", 
+        "market_leaders": [], 
+        "key_competitors": [], 
+        "competitive_gaps": [], 
+        "pricing_landscape": ""
+    },
+    "customer_insights": {
+        "primary_pain_points": [], 
+        "unmet_needs": [], 
+        "customer_segments": [], 
+        "satisfaction_drivers": [], 
+        "feature_priorities": []
+    },
+    "pmf_assessment": {
+        "market_opportunities": [], 
+        "product_fit_score": "Error", 
+        "key_risks": [], 
+        "success_probability": "Unknown", 
+        "time_to_market": "Error"
+    },
+    "strategic_recommendations": {
+        "immediate_actions": [], 
+        "product_development": [], 
+        "market_entry": [], 
+        "competitive_strategy": [], 
+        "success_metrics": []
+    },
+    "synthesis": {
+        "executive_summary": "",
+        "key_insights": [{
+            "insight": "Error occurred during report generation", 
+            "impact": "High", 
+            "confidence": "Low"
+        }],
+        "actionable_recommendations": ["Please retry the research task"],
+        "next_steps": ["Contact support if the issue persists"]
+    }
+})
+
+async def _analysis_for_prompt(agent_result: Optional[Dict[str, Any]]) -> str:
+    """JSON text of a successful agent analysis, reusing the text the agent parsed when present"""
+    if not agent_result or agent_result.get("status") != "success":
+        return "{}"
+    analysis_json = agent_result.get("analysis_json")
+    if analysis_json:
+        return analysis_json
+    # Off the event loop: analyses split from a combined response carry no JSON text of their own
+    return await run_json_task(_dumps, agent_result.get("analysis", {}))
 
-    def __init__(self, openai_api_key: str):
-        from app.core.ai_client import get_llm_client
-        self.llm = get_llm_client(openai_api_key)
+class ReportGenerationAgent:
+    
+    __slots__ = ("llm",)
+    
+    def __init__(self, openai_api_key: str, llm: Optional[Any] = None):
+        self.llm = llm or get_llm_client(openai_api_key)
     
     async def generate_report(
         self,
@@ -30,34 +97,34 @@ class ReportGenerationAgent:
             product_idea = context.get("product_idea", "")
             sector = context.get("sector", "")
             
-            market_analysis = market_result.get("analysis", {}) if market_result and market_result.get("status") == "success" else {}
-            competitor_analysis = (competitor_result.get("analysis", {})
-                                   if competitor_result and competitor_result.get("status") == "success" else {})
-            customer_insights = (customer_result.get("analysis", {})
-                                 if customer_result and customer_result.get("status") == "success" else {})
-            
             market_count = market_result.get("sources_analyzed", 0) if market_result else 0
             competitor_count = competitor_result.get("sources_analyzed", 0) if competitor_result else 0
             customer_count = customer_result.get("sources_analyzed", 0) if customer_result else 0
             
+            # The single report call needs all three analyses, so they are prepared concurrently
+            market_analysis, competitor_analysis, customer_insights = await asyncio.gather(
+                _analysis_for_prompt(market_result),
+                _analysis_for_prompt(competitor_result),
+                _analysis_for_prompt(customer_result)
+            )
+            
             system_prompt, human_prompt = format_report_generator_prompt(
                 sector=sector,
                 product_idea=product_idea,
-                market_analysis=json.dumps(market_analysis, indent=2),
-                competitor_analysis=json.dumps(competitor_analysis, indent=2),
-                customer_insights=json.dumps(customer_insights, indent=2),
+                market_analysis=market_analysis,
+                competitor_analysis=competitor_analysis,
+                customer_insights=customer_insights,
                 market_count=market_count,
                 competitor_count=competitor_count,
                 customer_count=customer_count
             )
             
-            response = await self.llm.ainvoke([
-                SystemMessage(content=system_prompt),
-                HumanMessage(content=human_prompt)
-            ])
-            
-            json_content = extract_json_from_response(response.content)
-            final_report = json.loads(json_content)
+            final_report = await llm_response_cache.ainvoke_parsed(
+                self.llm, "report", system_prompt, human_prompt, parse_json_response, request_id
+            )
+            # Citations are merged by URL here rather than by the model
+            if isinstance(final_report, dict) and isinstance(final_report.get("citations"), list):
+                final_report["citations"] = dedupe_citations(final_report["citations"])
             
             result = {
                 "agent_name": "ReportGenerationAgent",
@@ -71,7 +138,7 @@ class ReportGenerationAgent:
                     "total_sources": market_count + competitor_count + customer_count,
                     "analysis_method": "LangGraph-enhanced report generation"
                 },
-                "timestamp": datetime.now().isoformat(),
+                "timestamp": now_iso(),
                 "context": {
                     "sector": sector,
                     "product_idea": product_idea,
@@ -81,62 +148,19 @@ class ReportGenerationAgent:
             
             return result
             
-        except json.JSONDecodeError as e:
-            logger.error(f"[{request_id}] ReportGenerationAgent: JSON parsing failed - {e}")
+        except orjson.JSONDecodeError as e:
+            logger.error("[%s] ReportGenerationAgent: JSON parsing failed - %s", request_id, e)
             return self._create_error_result(context, f"JSON parsing error: {str(e)}")
             
         except Exception as e:
-            logger.error(f"[{request_id}] ReportGenerationAgent: Report generation failed - {e}")
+            logger.error("[%s] ReportGenerationAgent: Report generation failed - %s", request_id, e)
             return self._create_error_result(context, str(e))
     
     def _create_error_report(self, error_msg: str) -> Dict[str, Any]:
-        return {
-            "market_insights": {
-                "market_size": "See raw analysis", 
-                "growth_rate": "Error", 
-                "key_trends": [], 
-                "market_drivers": [], 
-                "future_outlook": ""
-            },
-            "competitive_landscape": {
-                "competitive_landscape": "", 
-                "market_leaders": [], 
-                "key_competitors": [], 
-                "competitive_gaps": [], 
-                "pricing_landscape": ""
-            },
-            "customer_insights": {
-                "primary_pain_points": [], 
-                "unmet_needs": [], 
-                "customer_segments": [], 
-                "satisfaction_drivers": [], 
-                "feature_priorities": []
-            },
-            "pmf_assessment": {
-                "market_opportunities": [], 
-                "product_fit_score": "Error", 
-                "key_risks": [], 
-                "success_probability": "Unknown", 
-                "time_to_market": "Error"
-            },
-            "strategic_recommendations": {
-                "immediate_actions": [], 
-                "product_development": [], 
-                "market_entry": [], 
-                "competitive_strategy": [], 
-                "success_metrics": []
-            },
-            "synthesis": {
-                "executive_summary": f"Report generation failed: {error_msg}",
-                "key_insights": [{
-                    "insight": "Error occurred during report generation", 
-                    "impact": "High", 
-                    "confidence": "Low"
-                }],
-                "actionable_recommendations": ["Please retry the research task"],
-                "next_steps": ["Contact support if the issue persists"]
-            }
-        }
+        # Deep copy: the template's nested sections and lists must not be shared between reports
+        report = copy.deepcopy(dict(_ERROR_REPORT_TEMPLATE))
+        report["synthesis"]["executive_summary"] = f"Report generation failed: {error_msg}"
+        return report
     
     def _create_error_result(self, context: Dict[str, Any], error_msg: str) -> Dict[str, Any]:
         return {
@@ -152,6 +176,6 @@ class ReportGenerationAgent:
                 "total_sources": 0,
                 "analysis_method": "Error occurred"
             },
-            "timestamp": datetime.now().isoformat(),
+            "timestamp": now_iso(),
             "context": context
         }
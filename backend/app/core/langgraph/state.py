@@ -1,11 +1,15 @@
+from dataclasses import dataclass, field
 from typing import Dict, Any, List, Optional, TypedDict, Annotated
-from datetime import datetime
 from langgraph.graph import add_messages
 from langchain_core.messages import BaseMessage
 
+from app.core.utils import now_iso
+
 class ResearchContext(TypedDict):
     product_idea: str
     sector: str
+    # Sector named by the research plan; may be filled in when the caller supplied none
+    sector_inferred: str
     research_depth: str
     max_sources: int
     request_id: str
@@ -20,22 +24,35 @@ class AgentResult(TypedDict):
     data_sources: Dict[str, Any]
     error: Optional[str]
     timestamp: str
+    # JSON text the analysis was parsed from; lets the report stage skip re-serializing it
+    analysis_json: Optional[str]
+
+# Bit set in ResearchState.agent_status_mask when an analysis agent succeeds
+AGENT_STATUS_BITS = {"market": 0b001, "competitor": 0b010, "customer": 0b100}
+ALL_AGENTS_OK = 0b111
 
-class ResearchState(TypedDict):
+# Graph state is a slotted dataclass (attribute access, no per-field hashing); context and
+# agent results stay dicts because agents read them with .get() and they are persisted as JSON
+@dataclass(slots=True)
+class ResearchState:
     context: ResearchContext
-    market_result: Optional[AgentResult]
-    competitor_result: Optional[AgentResult] 
-    customer_result: Optional[AgentResult]
-    report_result: Optional[AgentResult]
-    current_step: str
-    progress: int
-    status: str
-    messages: Annotated[List[BaseMessage], add_messages]
-    research_plan: Optional[Dict[str, Any]]
-    final_report: Optional[Dict[str, Any]]
-    errors: List[str]
-    abort_requested: bool
-    stream_data: Dict[str, Any]
+    market_result: Optional[AgentResult] = None
+    competitor_result: Optional[AgentResult] = None
+    customer_result: Optional[AgentResult] = None
+    report_result: Optional[AgentResult] = None
+    agent_status_mask: int = 0
+    current_step: str = "initializing"
+    progress: int = 0
+    status: str = "initializing"
+    messages: Annotated[List[BaseMessage], add_messages] = field(default_factory=list)
+    research_plan: Optional[Dict[str, Any]] = None
+    # Search query per analysis agent, derived once from research_plan; kept on the state (not
+    # the shared supervisor) so concurrent runs never see each other's queries
+    queries: Optional[Dict[str, str]] = None
+    final_report: Optional[Dict[str, Any]] = None
+    errors: List[str] = field(default_factory=list)
+    abort_requested: bool = False
+    stream_data: Dict[str, Any] = field(default_factory=dict)
 
 def create_initial_state(
     product_idea: str,
@@ -43,46 +60,34 @@ def create_initial_state(
     research_depth: str = "standard",
     request_id: str = "unknown"
 ) -> ResearchState:
-    now = datetime.now().isoformat()
+    now = now_iso()
     
     return ResearchState(
         context=ResearchContext(
             product_idea=product_idea,
             sector=sector,
+            sector_inferred="",
             research_depth=research_depth,
             max_sources=20,  # Hard-coded to 20 for all tasks
             request_id=request_id,
             created_at=now,
             updated_at=now
-        ),
-        market_result=None,
-        competitor_result=None,
-        customer_result=None,
-        report_result=None,
-        current_step="initializing",
-        progress=0,
-        status="initializing",
-        messages=[],
-        research_plan=None,
-        final_report=None,
-        errors=[],
-        abort_requested=False,
-        stream_data={}
+        )
     )
 
 def add_error_to_state(state: ResearchState, error: str) -> ResearchState:
-    state["errors"].append(f"{datetime.now().isoformat()}: {error}")
-    state["status"] = "failed"
+    state.errors.append(f"{now_iso()}: {error}")
+    state.status = "failed"
     return state
 
 def mark_aborted(state: ResearchState) -> ResearchState:
-    state["status"] = "aborted"
-    state["abort_requested"] = True
-    state["updated_at"] = datetime.now().isoformat()
+    state.status = "aborted"
+    state.abort_requested = True
+    state.context["updated_at"] = now_iso()
     return state
 
 def mark_completed(state: ResearchState) -> ResearchState:
-    state["status"] = "completed"
-    state["progress"] = 100
-    state["updated_at"] = datetime.now().isoformat()
+    state.status = "completed"
+    state.progress = 100
+    state.context["updated_at"] = now_iso()
     return state
@@ -1,293 +1,344 @@
 import asyncio
-import json
+import copy
+import hashlib
+import threading
+from collections import OrderedDict
+from contextvars import ContextVar
+from functools import lru_cache
 from typing import Dict, Any, List, Optional, Callable
 from datetime import datetime
 
 from langchain_openai import ChatOpenAI
 from langchain_core.messages import HumanMessage, SystemMessage, AIMessage
 from langgraph.graph import StateGraph, START, END
-from langgraph.checkpoint.memory import MemorySaver
 
-from .state import ResearchState, create_initial_state, add_error_to_state, mark_completed, mark_aborted
+from .state import (
+    ResearchState, AGENT_STATUS_BITS, ALL_AGENTS_OK,
+    create_initial_state, add_error_to_state, mark_completed, mark_aborted
+)
 from .agents import (
     MarketAnalysisAgent,
     CompetitorAnalysisAgent,
     CustomerInsightsAgent,
-    ReportGenerationAgent
+    ReportGenerationAgent,
+    CombinedAnalysisAgent
 )
-from app.core.config import get_logger
-from app.core.utils import extract_json_from_response
+from app.core.config import get_logger, get_settings
+from app.core.ai_client import get_llm_client
+from app.core.utils import parse_json_response
 from app.core.prompts import format_orchestrator_parse_prompt
 from app.services.progress_tracker import progress_tracker
+from app.services.llm_cache import llm_response_cache
 
 logger = get_logger(__name__)
 
-class ResearchSupervisor:
+# Next step once a research plan exists, keyed by agent_status_mask (anything else: finalization)
+_NEXT_STEP_BY_AGENT_MASK = {
+    0: "parallel_analysis",
+    ALL_AGENTS_OK: "report_generation"
+}
+
+def _queries_from_plan(research_plan: Dict[str, Any]) -> Dict[str, str]:
+    """Search query per analysis agent, using the research plan's original format"""
+    return {
+        'market': research_plan.get('market_query', ''),
+        'competitor': research_plan.get('competitor_query', ''),
+        'customer': research_plan.get('customer_query', '')
+    }
+
+# Parsed research plans by sha256(product_idea), most recently used last; the plan is a pure
+# function of the idea, so repeats skip both the Redis lookup and the OpenAI call
+_PLAN_CACHE_SIZE = 512
+_plan_cache: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+# Worker threads each run their own loop (below), so cache reads and evictions are serialized
+_plan_cache_lock = threading.Lock()
+
+# Event loop reused by execute_research_sync across tasks, one per worker thread, so pooled
+# HTTP connections bound to it (Tavily, OpenAI) survive from one task to the next
+_worker_loop_state = threading.local()
+
+def _get_worker_loop() -> asyncio.AbstractEventLoop:
+    loop = getattr(_worker_loop_state, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        _worker_loop_state.loop = loop
+    asyncio.set_event_loop(loop)
+    return loop
 
+def close_worker_loop() -> None:
+    """Close this thread's persistent event loop (called on worker process shutdown)"""
+    loop = getattr(_worker_loop_state, "loop", None)
+    if loop is None or loop.is_closed():
+        return
+    try:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+    finally:
+        loop.close()
+        _worker_loop_state.loop = None
+
+@lru_cache(maxsize=4)
+def _get_agents(openai_api_key: str, tavily_api_key: str) -> tuple:
+    """Build the analysis and report agents once per key pair; they hold no per-request state"""
+    # Use consistent AI client pattern
+    llm = get_llm_client(openai_api_key)
+    
+    # All agents share one client (and through it the process-wide HTTP pool)
+    market_agent = MarketAnalysisAgent(openai_api_key, tavily_api_key, llm=llm)
+    competitor_agent = CompetitorAnalysisAgent(openai_api_key, tavily_api_key, llm=llm)
+    customer_agent = CustomerInsightsAgent(openai_api_key, tavily_api_key, llm=llm)
+    combined_agent = CombinedAnalysisAgent(
+        {"market": market_agent, "competitor": competitor_agent, "customer": customer_agent}, llm
+    )
+    return (
+        llm,
+        market_agent,
+        competitor_agent,
+        customer_agent,
+        combined_agent,
+        ReportGenerationAgent(openai_api_key, llm=llm)
+    )
+
+@lru_cache(maxsize=4)
+def _get_supervisor(openai_api_key: str, tavily_api_key: str) -> "ResearchSupervisor":
+    """Get the shared ResearchSupervisor for a key pair"""
+    return ResearchSupervisor(openai_api_key, tavily_api_key)
+
+class ResearchSupervisor:
+    
     def __init__(self, openai_api_key: str, tavily_api_key: str):
         self.openai_api_key = openai_api_key
         self.tavily_api_key = tavily_api_key
-        # Use consistent AI client pattern
-        from app.core.ai_client import get_llm_client
-        self.llm = get_llm_client(openai_api_key)
+        (
+            self.llm,
+            self.market_agent,
+            self.competitor_agent,
+            self.customer_agent,
+            self.combined_agent,
+            self.report_agent
+        ) = _get_agents(openai_api_key, tavily_api_key)
         
-        self.market_agent = MarketAnalysisAgent(openai_api_key, tavily_api_key)
-        self.competitor_agent = CompetitorAnalysisAgent(openai_api_key, tavily_api_key)
-        self.customer_agent = CustomerInsightsAgent(openai_api_key, tavily_api_key)
-        self.report_agent = ReportGenerationAgent(openai_api_key)
-        
-        self.workflow = self._create_workflow()
-        
-    def _create_workflow(self) -> StateGraph:
-        workflow = StateGraph(ResearchState)
-        
-        workflow.add_node("supervisor", self._supervisor_node)
-        workflow.add_node("parallel_analysis", self._parallel_analysis_node)
-        workflow.add_node("report_generation", self._report_generation_node)
-        workflow.add_node("finalization", self._finalization_node)
-        
-        workflow.add_edge(START, "supervisor")
-        workflow.add_conditional_edges(
-            "supervisor",
-            self._supervisor_router,
-            {
-                "parallel_analysis": "parallel_analysis",
-                "report_generation": "report_generation",
-                "finalization": "finalization",
-                "end": END
-            }
-        )
-        
-        workflow.add_edge("parallel_analysis", "report_generation")
-        
-        workflow.add_edge("report_generation", "finalization")
-        workflow.add_edge("finalization", END)
-        
-        memory = MemorySaver()
-        return workflow.compile(checkpointer=memory)
+        # The graph is compiled once per process; nodes reach this instance through _current_supervisor
+        self.workflow = _WORKFLOW
     
     async def _supervisor_node(self, state: ResearchState) -> ResearchState:
         try:
-            context = state["context"]
+            context = state.context
             request_id = context["request_id"]
-
-            if state.get("abort_requested", False):
+            
+            if state.abort_requested:
                 return mark_aborted(state)
             
             # Create research plan if not already created
-            if state.get("research_plan") is None:
+            if state.research_plan is None:
                 research_plan = await self._parse_and_generate_queries(
                     context["product_idea"], request_id
                 )
-                state["research_plan"] = research_plan
-                progress_tracker.complete_checkpoint(request_id, "research_plan_created")
+                state.research_plan = research_plan
+                state.queries = _queries_from_plan(research_plan)
+                context["sector_inferred"] = research_plan.get("sector") or ""
+                # The plan call also produces the search queries, so both checkpoints land together
+                await progress_tracker.acomplete_checkpoints(
+                    request_id, ["research_plan_created", "queries_generated"]
+                )
             
-            next_step = await self._determine_next_step(state)
-            state["current_step"] = next_step
+            next_step = self._determine_next_step(state)
+            state.current_step = next_step
             
-            state["messages"].append(
+            state.messages.append(
                 AIMessage(content=f"Supervisor decided: {next_step}")
             )
             
             return state
-            
+        
         except Exception as e:
-            logger.error(f"Supervisor node error: {e}")
+            logger.error("Supervisor node error: %s", e)
             return add_error_to_state(state, f"Supervisor error: {str(e)}")
     
-    async def _determine_next_step(self, state: ResearchState) -> str:
-        context = state["context"]
-        
+    def _determine_next_step(self, state: ResearchState) -> str:
+        """Pick the next node from attribute reads on the state; no I/O, so no coroutine"""
         # Fail fast on any errors - don't continue the workflow
-        if state.get("errors") and len(state["errors"]) > 0:
-            logger.error(f"Workflow has errors, failing: {state['errors']}")
+        if state.errors:
+            logger.error("Workflow has errors, failing: %s", state.errors)
             return "finalization"
         
         # Check if we have research plan
-        if state.get("research_plan") is None:
+        if state.research_plan is None:
             return "parallel_analysis"
         
-        # Check if parallel analysis is complete
-        if (state["market_result"] is None and
-                state["competitor_result"] is None and
-                state["customer_result"] is None):
-            return "parallel_analysis"
+        if state.report_result is not None:
+            return "finalization"
         
-        # Check if report generation is needed
-        if state["report_result"] is None:
-            return "report_generation"
-            
-        return "finalization"
+        # No agent done yet -> analysis, all three done -> report
+        return _NEXT_STEP_BY_AGENT_MASK.get(state.agent_status_mask, "finalization")
     
     def _supervisor_router(self, state: ResearchState) -> str:
-        return state["current_step"]
+        return state.current_step
     
     
     async def _parallel_analysis_node(self, state: ResearchState) -> ResearchState:
         try:
-            context = state["context"]
+            context = state.context
             request_id = context["request_id"]
-
-            # Get queries from research plan
-            research_plan = state.get("research_plan", {})
-            if not research_plan:
-                return add_error_to_state(state, "Research plan not found")
             
-            # Extract queries from research plan using original format
-            queries = {
-                'market': research_plan.get('market_query', ''),
-                'competitor': research_plan.get('competitor_query', ''),
-                'customer': research_plan.get('customer_query', '')
-            }
+            # Queries are derived from the research plan once and then read from the state
+            if state.queries is None:
+                if not state.research_plan:
+                    return add_error_to_state(state, "Research plan not found")
+                state.queries = _queries_from_plan(state.research_plan)
+            queries = state.queries
             
             # Debug logging to check query values
-            logger.info(f"[{request_id}] Extracted queries: market='{queries['market']}', competitor='{queries['competitor']}', customer='{queries['customer']}'")
-            
-            # Checkpoint 2: Queries generated (search queries ready)
-            progress_tracker.complete_checkpoint(request_id, "queries_generated")
-            
-            import asyncio
-            tasks = [
-                self.market_agent.analyze_market_trends(
-                    query=queries['market'],
-                    context=context,
-                    request_id=request_id
-                ),
-                self.competitor_agent.analyze_competitors(
-                    query=queries['competitor'],
-                    context=context,
-                    request_id=request_id
-                ),
-                self.customer_agent.analyze_customer_insights(
-                    query=queries['customer'],
-                    context=context,
-                    request_id=request_id
-                )
-            ]
-            
-            results = await asyncio.gather(*tasks, return_exceptions=True)
-            
-            # Fail fast on any agent failures
-            if isinstance(results[0], Exception):
-                error_msg = f"Market agent failed: {results[0]}"
-                logger.error(f"[{request_id}] {error_msg}")
-                return add_error_to_state(state, error_msg)
-            if isinstance(results[1], Exception):
-                error_msg = f"Competitor agent failed: {results[1]}"
-                logger.error(f"[{request_id}] {error_msg}")
-                return add_error_to_state(state, error_msg)
-            if isinstance(results[2], Exception):
-                error_msg = f"Customer agent failed: {results[2]}"
-                logger.error(f"[{request_id}] {error_msg}")
-                return add_error_to_state(state, error_msg)
+            logger.info(
+                "[%s] Extracted queries: market='%s', competitor='%s', customer='%s'",
+                request_id, queries['market'], queries['competitor'], queries['customer']
+            )
             
-            # Check if any agent returned an error status
-            market_result = results[0]
-            competitor_result = results[1]
-            customer_result = results[2]
+            if get_settings().combined_analysis_enabled:
+                # One LLM call covers all three analyses; the searches still run in parallel
+                results = await self.combined_agent.analyze(queries, context, request_id)
+                for name, result in results.items():
+                    error_msg = self._record_agent_result(state, name, result)
+                    if error_msg:
+                        logger.error("[%s] %s", request_id, error_msg)
+                        return add_error_to_state(state, error_msg)
+                return state
             
-            if market_result and market_result.get("status") == "error":
-                error_msg = f"Market analysis failed: {market_result.get('error', 'Unknown error')}"
-                logger.error(f"[{request_id}] {error_msg}")
-                return add_error_to_state(state, error_msg)
-            if competitor_result and competitor_result.get("status") == "error":
-                error_msg = f"Competitor analysis failed: {competitor_result.get('error', 'Unknown error')}"
-                logger.error(f"[{request_id}] {error_msg}")
-                return add_error_to_state(state, error_msg)
-            if customer_result and customer_result.get("status") == "error":
-                error_msg = f"Customer analysis failed: {customer_result.get('error', 'Unknown error')}"
-                logger.error(f"[{request_id}] {error_msg}")
-                return add_error_to_state(state, error_msg)
+            agent_calls = {
+                "market": self.market_agent.analyze_market_trends,
+                "competitor": self.competitor_agent.analyze_competitors,
+                "customer": self.customer_agent.analyze_customer_insights
+            }
+            pending = {
+                asyncio.create_task(analyze(query=queries[name], context=context, request_id=request_id)): name
+                for name, analyze in agent_calls.items()
+            }
             
-            state["market_result"] = market_result
-            state["competitor_result"] = competitor_result
-            state["customer_result"] = customer_result
+            # Store each result as soon as its agent finishes and fail fast on the first failure
+            try:
+                while pending:
+                    done, _ = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                    for task in done:
+                        name = pending.pop(task)
+                        label = name.capitalize()
+                        
+                        if task.exception() is not None:
+                            error_msg = f"{label} agent failed: {task.exception()}"
+                            logger.error("[%s] %s", request_id, error_msg)
+                            return add_error_to_state(state, error_msg)
+                        
+                        error_msg = self._record_agent_result(state, name, task.result())
+                        if error_msg:
+                            logger.error("[%s] %s", request_id, error_msg)
+                            return add_error_to_state(state, error_msg)
+            finally:
+                # Nothing left to wait for once the node has failed
+                for task in pending:
+                    task.cancel()
             
             return state
-            
+        
         except Exception as e:
-            logger.error(f"Parallel analysis error: {e}")
+            logger.error("Parallel analysis error: %s", e)
             return add_error_to_state(state, f"Parallel analysis error: {str(e)}")
-
+    
+    def _record_agent_result(self, state: ResearchState, name: str, result: Dict[str, Any]) -> Optional[str]:
+        """Store an agent's result on the state; returns the error message if the agent failed"""
+        if result and result.get("status") == "error":
+            return f"{name.capitalize()} analysis failed: {result.get('error', 'Unknown error')}"
+        
+        setattr(state, f"{name}_result", result)
+        if result and result.get("status") == "success":
+            state.agent_status_mask |= AGENT_STATUS_BITS[name]
+        return None
+    
     async def _report_generation_node(self, state: ResearchState) -> ResearchState:
         try:
-            context = state["context"]
+            context = state.context
             request_id = context["request_id"]
-
-            # Check if all 3 analysis agents were successful before generating report
-            market_success = state.get("market_result", {}).get("status") == "success"
-            competitor_success = state.get("competitor_result", {}).get("status") == "success"
-            customer_success = state.get("customer_result", {}).get("status") == "success"
             
-            if not (market_success and competitor_success and customer_success):
-                failed_agents = []
-                if not market_success:
-                    failed_agents.append("market analysis")
-                if not competitor_success:
-                    failed_agents.append("competitor analysis")
-                if not customer_success:
-                    failed_agents.append("customer analysis")
+            # Check if all 3 analysis agents were successful before generating report
+            if state.agent_status_mask != ALL_AGENTS_OK:
+                failed_agents = [
+                    f"{name} analysis" for name, bit in AGENT_STATUS_BITS.items()
+                    if not state.agent_status_mask & bit
+                ]
                 
                 error_msg = f"Cannot generate report: {', '.join(failed_agents)} failed"
-                logger.error(f"[{request_id}] {error_msg}")
+                logger.error("[%s] %s", request_id, error_msg)
                 return add_error_to_state(state, error_msg)
-
-            progress_tracker.complete_checkpoint(request_id, "report_generation_started")
             
-            result = await self.report_agent.generate_report(
-                market_result=state["market_result"],
-                competitor_result=state["competitor_result"],
-                customer_result=state["customer_result"],
-                context=context,
-                request_id=request_id
+            # Recorded while the report is generated instead of before it; finished before the
+            # completed checkpoint so the two never land out of order
+            started_checkpoint = asyncio.create_task(
+                progress_tracker.acomplete_checkpoint(request_id, "report_generation_started")
             )
+            try:
+                result = await self.report_agent.generate_report(
+                    market_result=state.market_result,
+                    competitor_result=state.competitor_result,
+                    customer_result=state.customer_result,
+                    context=context,
+                    request_id=request_id
+                )
+            finally:
+                await started_checkpoint
             
             # Fail fast if report generation failed
             if result and result.get("status") == "error":
                 error_msg = f"Report generation failed: {result.get('error', 'Unknown error')}"
-                logger.error(f"[{request_id}] {error_msg}")
+                logger.error("[%s] %s", request_id, error_msg)
                 return add_error_to_state(state, error_msg)
             
-            state["report_result"] = result
-            state["final_report"] = result.get("final_report", {})
+            state.report_result = result
+            state.final_report = result.get("final_report", {})
             
-            progress_tracker.complete_checkpoint(request_id, "report_generation_completed")
+            await progress_tracker.acomplete_checkpoint(request_id, "report_generation_completed")
             
             return state
-            
+        
         except Exception as e:
-            logger.error(f"Report generation error: {e}")
+            logger.error("Report generation error: %s", e)
             return add_error_to_state(state, f"Report generation error: {str(e)}")
     
     async def _finalization_node(self, state: ResearchState) -> ResearchState:
         try:
-            context = state["context"]
+            context = state.context
             request_id = context["request_id"]
-
-            progress_tracker.complete_checkpoint(request_id, "final_report_delivered")
+            
+            await progress_tracker.acomplete_checkpoint(request_id, "final_report_delivered")
             
             state = mark_completed(state)
             
             return state
-            
+        
         except Exception as e:
-            logger.error(f"Finalization error: {e}")
+            logger.error("Finalization error: %s", e)
             return add_error_to_state(state, f"Finalization error: {str(e)}")
     
     async def _parse_and_generate_queries(self, product_idea: str, request_id: str) -> Dict[str, Any]:
-        # Checkpoint: Queries generated (moved to parallel_analysis_node)
+        # Checkpoints are emitted by the caller, so a cache hit still records them
+        plan_key = hashlib.sha256(product_idea.encode()).hexdigest()
+        with _plan_cache_lock:
+            plan = _plan_cache.get(plan_key)
+            if plan is not None:
+                _plan_cache.move_to_end(plan_key)
+        if plan is not None:
+            logger.info("[%s] Research plan cache hit", request_id)
+            # Deep copy: runs must not share the plan's nested values
+            return copy.deepcopy(plan)
         
         system_prompt, human_prompt = format_orchestrator_parse_prompt(product_idea)
         
-        response = await self.llm.ainvoke([
-            SystemMessage(content=system_prompt),
-            HumanMessage(content=human_prompt)
-        ])
-        
-        json_content = extract_json_from_response(response.content)
-        parsed = json.loads(json_content)
+        # Across processes the exact-prompt Redis cache (24h TTL) plays the same role
+        plan = await llm_response_cache.ainvoke_parsed(
+            self.llm, "orchestrator", system_prompt, human_prompt, parse_json_response, request_id
+        )
         
-        return parsed
+        with _plan_cache_lock:
+            _plan_cache[plan_key] = plan
+            if len(_plan_cache) > _PLAN_CACHE_SIZE:
+                _plan_cache.popitem(last=False)
+        return copy.deepcopy(plan)
     
     async def execute_research(
         self,
@@ -311,87 +362,114 @@ class ResearchSupervisor:
                 "configurable": {"thread_id": request_id},
                 "recursion_limit": 50
             }
-            final_state = None
-            async for chunk in self.workflow.astream(initial_state, config=config):
-                if progress_callback:
-                    await self._handle_streaming_update(chunk, progress_callback)
-                
-                if abort_check and abort_check():
-                    break
-                
-                final_state = chunk
+            # Each chunk is {node_name: state_values} for the node that just ran
+            final_node, state_values = None, None
+            last_update = None
+            supervisor_token = _current_supervisor.set(self)
+            try:
+                async for chunk in self.workflow.astream(initial_state, config=config):
+                    node_name, node_values = next(iter(chunk.items()), (None, None))
+                    if progress_callback:
+                        last_update = await self._handle_streaming_update(
+                            node_name, node_values, progress_callback, last_update
+                        )
+                    
+                    if abort_check and abort_check():
+                        break
+                    
+                    final_node, state_values = node_name, node_values
+            finally:
+                _current_supervisor.reset(supervisor_token)
             
-            if not final_state:
+            if final_node is None:
                 return {
                     "success": False,
                     "error": "Workflow execution failed",
                     "request_id": request_id
                 }
             
-            if final_state:
-                state = final_state.get(list(final_state.keys())[0])
-                if state:
-                    if state.get("status") == "completed":
-                        return self._build_success_response(state)
-                    else:
-                        return self._build_error_response(state)
+            if state_values:
+                # Stream chunks carry plain field dicts; rebuild the state object at the boundary
+                state = ResearchState(**state_values)
+                if state.status == "completed":
+                    return self._build_success_response(state, state.context)
+                else:
+                    return self._build_error_response(state, request_id)
             
             return {
                 "success": False,
                 "error": "No final state found",
                 "request_id": request_id
             }
-                
+        
         except Exception as e:
-            logger.error(f"Research execution failed: {e}")
+            logger.error("Research execution failed: %s", e)
             return {
                 "success": False,
                 "error": f"Research execution failed: {str(e)}",
                 "request_id": request_id
             }
     
-    async def _handle_streaming_update(self, chunk: Dict, progress_callback: Callable):
+    async def _handle_streaming_update(
+        self,
+        node_name: Optional[str],
+        state: Any,
+        progress_callback: Callable,
+        last_update: Optional[tuple] = None
+    ) -> Optional[tuple]:
+        """Report a node's (step, progress) unless it equals the last one reported; returns the last reported"""
         try:
-            for node_name, state in chunk.items():
-                if isinstance(state, dict) and "progress" in state:
-                    await progress_callback(
-                        state.get("current_step", "processing"),
-                        state.get("progress", 0),
-                        f"Node: {node_name}"
-                    )
+            if not (isinstance(state, dict) and "progress" in state):
+                return last_update
+            
+            update = (state.get("current_step", "processing"), state.get("progress", 0))
+            if update != last_update:
+                await progress_callback(update[0], update[1], f"Node: {node_name}")
+            return update
         except Exception as e:
-            logger.warning(f"Streaming update error: {e}")
+            logger.warning("Streaming update error: %s", e)
+            return last_update
     
-    def _build_success_response(self, state: ResearchState) -> Dict[str, Any]:
+    @staticmethod
+    def _public_result(result: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+        """Drop pipeline-internal fields before a result is returned and persisted.
+        
+        Done in place: the run is over, so the state holding the result is discarded.
+        """
+        if result:
+            result.pop("analysis_json", None)
+        return result
+    
+    def _build_success_response(self, state: ResearchState, context: Dict[str, Any]) -> Dict[str, Any]:
         return {
             "success": True,
-            "research_plan": state.get("research_plan", {}),
-            "market_trends_result": state.get("market_result", {}),
-            "competitor_result": state.get("competitor_result", {}),
-            "customer_result": state.get("customer_result", {}),
-            "synthesis_result": state.get("report_result", {}),
-            "final_report": state.get("final_report", {}),
+            "research_plan": state.research_plan or {},
+            "market_trends_result": self._public_result(state.market_result or {}),
+            "competitor_result": self._public_result(state.competitor_result or {}),
+            "customer_result": self._public_result(state.customer_result or {}),
+            "synthesis_result": state.report_result or {},
+            "final_report": state.final_report or {},
             "metadata": {
-                "sector": state["context"]["sector"],
-                "max_sources": state["context"]["max_sources"],
-                "research_depth": state["context"]["research_depth"],
-                "request_id": state["context"]["request_id"],
-                "completed_at": state["context"]["updated_at"]
+                "sector": context.get("sector_inferred") or context.get("sector", ""),
+                "max_sources": context.get("max_sources", 20),
+                "research_depth": context.get("research_depth", "standard"),
+                "request_id": context.get("request_id", "unknown"),
+                "completed_at": context.get("updated_at")
             }
         }
     
-    def _build_error_response(self, state: ResearchState) -> Dict[str, Any]:
+    def _build_error_response(self, state: ResearchState, request_id: str) -> Dict[str, Any]:
         return {
             "success": False,
-            "error": f"Research failed: {state.get('status', 'unknown')}",
-            "errors": state.get("errors", []),
+            "error": f"Research failed: {state.status}",
+            "errors": state.errors,
             "partial_results": {
-                "market": state.get("market_result"),
-                "competitor": state.get("competitor_result"),
-                "customer": state.get("customer_result"),
-                "report": state.get("report_result")
+                "market": self._public_result(state.market_result),
+                "competitor": self._public_result(state.competitor_result),
+                "customer": self._public_result(state.customer_result),
+                "report": state.report_result
             },
-            "request_id": state["context"]["request_id"]
+            "request_id": request_id
         }
     
     def execute_research_sync(
@@ -404,19 +482,64 @@ class ResearchSupervisor:
         progress_callback: Optional[Callable[[str, int, str], Any]] = None
     ) -> Dict[str, Any]:
         """Sync version of execute_research for Celery workers"""
-        import asyncio
-        
-        # Create a new event loop for this sync method
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
-        try:
-            return loop.run_until_complete(self.execute_research(
-                product_idea=product_idea,
-                sector=sector,
-                research_depth=research_depth,
-                request_id=request_id,
-                abort_check=abort_check,
-                progress_callback=progress_callback
-            ))
-        finally:
-            loop.close()
+        # Reuse the worker's loop instead of creating and closing one per task
+        loop = _get_worker_loop()
+        return loop.run_until_complete(self.execute_research(
+            product_idea=product_idea,
+            sector=sector,
+            research_depth=research_depth,
+            request_id=request_id,
+            abort_check=abort_check,
+            progress_callback=progress_callback
+        ))
+
+# Supervisor running the current execute_research call; graph nodes run in tasks that copy
+# the caller's context, so each run dispatches to its own supervisor
+_current_supervisor: ContextVar[ResearchSupervisor] = ContextVar("current_supervisor")
+
+async def _supervisor_node(state: ResearchState) -> ResearchState:
+    return await _current_supervisor.get()._supervisor_node(state)
+
+async def _parallel_analysis_node(state: ResearchState) -> ResearchState:
+    return await _current_supervisor.get()._parallel_analysis_node(state)
+
+async def _report_generation_node(state: ResearchState) -> ResearchState:
+    return await _current_supervisor.get()._report_generation_node(state)
+
+async def _finalization_node(state: ResearchState) -> ResearchState:
+    return await _current_supervisor.get()._finalization_node(state)
+
+def _supervisor_router(state: ResearchState) -> str:
+    return _current_supervisor.get()._supervisor_router(state)
+
+def _create_workflow():
+    workflow = StateGraph(ResearchState)
+    
+    workflow.add_node("supervisor", _supervisor_node)
+    workflow.add_node("parallel_analysis", _parallel_analysis_node)
+    workflow.add_node("report_generation", _report_generation_node)
+    workflow.add_node("finalization", _finalization_node)
+    
+    workflow.add_edge(START, "supervisor")
+    workflow.add_conditional_edges(
+        "supervisor",
+        _supervisor_router,
+        {
+            "parallel_analysis": "parallel_analysis",
+            "report_generation": "report_generation",
+            "finalization": "finalization",
+            "end": END
+        }
+    )
+    
+    workflow.add_edge("parallel_analysis", "report_generation")
+    
+    workflow.add_edge("report_generation", "finalization")
+    workflow.add_edge("finalization", END)
+    
+    # No checkpointer: runs are single-shot and never resumed, so snapshotting the
+    # full state after every node would only copy the large agent results (and retain
+    # them per thread_id). False also keeps a parent graph's checkpointer from applying.
+    return workflow.compile(checkpointer=False)
+
+_WORKFLOW = _create_workflow()
@@ -37,7 +37,7 @@ ARCHITECTURE:
 3. CITATION FLOW
    Hybrid approach for accuracy:
    - Data analysis agents track citations as they analyze (claim + url + title)
-   - Report Generator aggregates & deduplicates citations
+   - Report Generator aggregates citations (duplicates are merged by URL afterwards)
    - Final report has 10-20 verified sources
 
 OPENAI CALL OPTIMIZATION:
@@ -61,6 +61,10 @@ All reports follow this structure:
 - citations: Source attributions (claim, url, title, source_type)
 """
 
+from functools import lru_cache
+from string import Formatter
+from typing import Callable
+
 # =============================================================================
 # COMMON GUARDRAILS
 # =============================================================================
@@ -138,6 +142,25 @@ INFORMATION SECURITY (CRITICAL):
 10. Focus on aggregate data, trends, and public market information
 """
 
+# Guardrail blocks shared by every prompt of a kind, joined once at import
+_DATA_ANALYSIS_GUARDRAILS_BLOCK = "\n\n".join([
+    COMMON_GROUNDING_RULES,
+    COMMON_QUALITY_STANDARDS,
+    COMMON_PRODUCT_FOCUS,
+    COMMON_CITATION_TRACKING,
+    COMMON_INFOSEC_GUARDRAILS
+])
+_INPUT_PROCESSING_GUARDRAILS_BLOCK = "\n\n".join([
+    COMMON_INFOSEC_GUARDRAILS,
+    COMMON_PRODUCT_FOCUS
+])
+_OUTPUT_FORMAT_VALIDATION_BLOCK = f"\n\n{COMMON_OUTPUT_FORMAT}\n\n{COMMON_JSON_VALIDATION}"
+
+
+def _schema_block(schema: str) -> str:
+    return f"\n\n{schema}\n" if schema else ""
+
+
 def build_system_prompt_with_guardrails(role: str, specific_instructions: str, schema: str = "") -> str:
     """
     Build system prompt with 7 guardrails for DATA ANALYSIS agents.
@@ -153,33 +176,10 @@ def build_system_prompt_with_guardrails(role: str, specific_instructions: str, s
     Returns:
         Complete system prompt with all data analysis guardrails
     """
-    prompt_parts = [
-        f"You are a {role}.",
-        "",
-        COMMON_GROUNDING_RULES,
-        "",
-        COMMON_QUALITY_STANDARDS,
-        "",
-        COMMON_PRODUCT_FOCUS,
-        "",
-        COMMON_CITATION_TRACKING,
-        "",
-        COMMON_INFOSEC_GUARDRAILS,
-        "",
-        specific_instructions,
-    ]
-
-    if schema:
-        prompt_parts.extend(["", schema, ""])
-
-    prompt_parts.extend([
-        "",
-        COMMON_OUTPUT_FORMAT,
-        "",
-        COMMON_JSON_VALIDATION
-    ])
-
-    return "\n".join(prompt_parts)
+    return (
+        f"You are a {role}.\n\n{_DATA_ANALYSIS_GUARDRAILS_BLOCK}\n\n{specific_instructions}"
+        f"{_schema_block(schema)}{_OUTPUT_FORMAT_VALIDATION_BLOCK}"
+    )
 
 
 def build_input_processing_prompt(role: str, specific_instructions: str, schema: str = "") -> str:
@@ -198,27 +198,72 @@ def build_input_processing_prompt(role: str, specific_instructions: str, schema:
     Returns:
         System prompt with input-processing guardrails
     """
-    prompt_parts = [
-        f"You are a {role}.",
-        "",
-        COMMON_INFOSEC_GUARDRAILS,
-        "",
-        COMMON_PRODUCT_FOCUS,
-        "",
-        specific_instructions,
-    ]
+    return (
+        f"You are a {role}.\n\n{_INPUT_PROCESSING_GUARDRAILS_BLOCK}\n\n{specific_instructions}"
+        f"{_schema_block(schema)}{_OUTPUT_FORMAT_VALIDATION_BLOCK}"
+    )
+
+
+def compile_template(template: str) -> Callable[..., str]:
+    """
+    Pre-split a str.format() template once so rendering is a single join.
+
+    Gives the same text as template.format(**values) for templates that only
+    use plain {name} fields, without re-parsing the template on every call.
+
+    Args:
+        template: Template with {name} fields ({{ and }} for literal braces)
 
-    if schema:
-        prompt_parts.extend(["", schema, ""])
+    Returns:
+        Function taking the field values as keyword arguments
+    """
+    # (literal, field name) pairs, plus the literal text after the last field;
+    # escaped braces arrive as extra field-less literals and are merged in
+    fields = []
+    tail = ""
+    for literal, name, format_spec, conversion in Formatter().parse(template):
+        if format_spec or conversion:
+            raise ValueError(f"Unsupported field in template: {{{name}}}")
+        tail += literal
+        if name is not None:
+            fields.append((tail, name))
+            tail = ""
+
+    fields = tuple(fields)
+
+    def render(**values) -> str:
+        out = []
+        for literal, name in fields:
+            out.append(literal)
+            out.append(str(values[name]))
+        out.append(tail)
+        return "".join(out)
+
+    return render
+
+
+def compile_system_prompt(role: str, specific_instructions: str, schema: str = "") -> Callable[..., str]:
+    """
+    Build a data analysis system prompt once around its specific instructions.
+
+    Only the specific instructions vary per request, so the guardrails around
+    them are assembled at import time and rendering is a concatenation.
+
+    Args:
+        role: The agent's role
+        specific_instructions: Instruction template with {name} fields
+        schema: Optional JSON schema definition
+
+    Returns:
+        Function taking the instruction field values as keyword arguments
+    """
+    head, tail = build_system_prompt_with_guardrails(role, "\0", schema).split("\0")
+    render_instructions = compile_template(specific_instructions)
 
-    prompt_parts.extend([
-        "",
-        COMMON_OUTPUT_FORMAT,
-        "",
-        COMMON_JSON_VALIDATION
-    ])
+    def render(**values) -> str:
+        return head + render_instructions(**values) + tail
 
-    return "\n".join(prompt_parts)
+    return render
 
 # =============================================================================
 # ORCHESTRATOR PROMPTS
@@ -254,13 +299,16 @@ ORCHESTRATOR_SCHEMA = """
 }}
 """
 
+# Nothing in the orchestrator system prompt varies per request, so it is a constant
+_ORCHESTRATOR_SYSTEM_PROMPT = build_input_processing_prompt(
+    role="market research analyst specializing in input validation",
+    specific_instructions=ORCHESTRATOR_SPECIFIC_INSTRUCTIONS,
+    schema=ORCHESTRATOR_SCHEMA
+)
+
 def get_orchestrator_system_prompt() -> str:
     """Generate Orchestrator system prompt with 4 input-processing guardrails"""
-    return build_input_processing_prompt(
-        role="market research analyst specializing in input validation",
-        specific_instructions=ORCHESTRATOR_SPECIFIC_INSTRUCTIONS,
-        schema=ORCHESTRATOR_SCHEMA
-    )
+    return _ORCHESTRATOR_SYSTEM_PROMPT
 
 ORCHESTRATOR_PRODUCT_IDEA_HUMAN = """
 Product Idea (RAW USER INPUT): "{product_idea}"
@@ -268,6 +316,8 @@ Product Idea (RAW USER INPUT): "{product_idea}"
 Validate this input, identify the sector, and generate 3 search queries as specified.
 """
 
+_render_orchestrator_human = compile_template(ORCHESTRATOR_PRODUCT_IDEA_HUMAN)
+
 
 # =============================================================================
 # MARKET ANALYZER PROMPTS
@@ -307,13 +357,16 @@ MARKET_ANALYZER_SCHEMA = """
 }}
 """
 
+_render_market_analyzer_system = compile_system_prompt(
+    role="market research analyst",
+    specific_instructions=MARKET_ANALYZER_SPECIFIC_INSTRUCTIONS,
+    schema=MARKET_ANALYZER_SCHEMA
+)
+
+@lru_cache(maxsize=128)
 def get_market_analyzer_system_prompt(product_idea: str) -> str:
     """Generate Market Analyzer system prompt with 7 data analysis guardrails"""
-    return build_system_prompt_with_guardrails(
-        role="market research analyst",
-        specific_instructions=MARKET_ANALYZER_SPECIFIC_INSTRUCTIONS.format(product_idea=product_idea),
-        schema=MARKET_ANALYZER_SCHEMA
-    )
+    return _render_market_analyzer_system(product_idea=product_idea)
 
 MARKET_ANALYZER_ANALYSIS_HUMAN = """
 Product Idea: "{product_idea}"
@@ -325,6 +378,7 @@ Analyze this market data and provide insights specific to the product idea above
 
 Provide a product-specific market analysis in the specified JSON format.
 """
+_render_market_analyzer_analysis_human = compile_template(MARKET_ANALYZER_ANALYSIS_HUMAN)
 
 
 # =============================================================================
@@ -367,13 +421,16 @@ COMPETITOR_ANALYZER_SCHEMA = """
 }}
 """
 
+_render_competitor_analyzer_system = compile_system_prompt(
+    role="competitive intelligence analyst",
+    specific_instructions=COMPETITOR_ANALYZER_SPECIFIC_INSTRUCTIONS,
+    schema=COMPETITOR_ANALYZER_SCHEMA
+)
+
+@lru_cache(maxsize=128)
 def get_competitor_analyzer_system_prompt(product_idea: str) -> str:
     """Generate Competitor Analyzer system prompt with 7 data analysis guardrails"""
-    return build_system_prompt_with_guardrails(
-        role="competitive intelligence analyst",
-        specific_instructions=COMPETITOR_ANALYZER_SPECIFIC_INSTRUCTIONS.format(product_idea=product_idea),
-        schema=COMPETITOR_ANALYZER_SCHEMA
-    )
+    return _render_competitor_analyzer_system(product_idea=product_idea)
 
 COMPETITOR_ANALYZER_ANALYSIS_HUMAN = """
 Product Idea: "{product_idea}"
@@ -385,6 +442,7 @@ Analyze this competitor data specifically for the product idea above:
 
 Provide a product-specific competitor analysis in the specified JSON format.
 """
+_render_competitor_analyzer_analysis_human = compile_template(COMPETITOR_ANALYZER_ANALYSIS_HUMAN)
 
 
 # =============================================================================
@@ -434,13 +492,16 @@ CUSTOMER_INSIGHTS_SCHEMA = """
 }}
 """
 
+_render_customer_insights_system = compile_system_prompt(
+    role="customer experience analyst",
+    specific_instructions=CUSTOMER_INSIGHTS_SPECIFIC_INSTRUCTIONS,
+    schema=CUSTOMER_INSIGHTS_SCHEMA
+)
+
+@lru_cache(maxsize=128)
 def get_customer_insights_system_prompt(product_idea: str) -> str:
     """Generate Customer Insights Analyzer system prompt with 7 data analysis guardrails"""
-    return build_system_prompt_with_guardrails(
-        role="customer experience analyst",
-        specific_instructions=CUSTOMER_INSIGHTS_SPECIFIC_INSTRUCTIONS.format(product_idea=product_idea),
-        schema=CUSTOMER_INSIGHTS_SCHEMA
-    )
+    return _render_customer_insights_system(product_idea=product_idea)
 
 CUSTOMER_INSIGHTS_ANALYSIS_HUMAN = """
 Product Idea: "{product_idea}"
@@ -452,6 +513,72 @@ Analyze this customer feedback specifically for the product idea above:
 
 Provide product-specific customer insights in the specified JSON format.
 """
+_render_customer_insights_analysis_human = compile_template(CUSTOMER_INSIGHTS_ANALYSIS_HUMAN)
+
+
+# =============================================================================
+# COMBINED ANALYZER PROMPTS (market + competitor + customer in one call)
+# =============================================================================
+
+COMBINED_ANALYZER_SPECIFIC_INSTRUCTIONS = """
+Analyze three datasets specifically for THIS PRODUCT: "{product_idea}"
+Produce three independent analyses, each grounded ONLY in its own dataset.
+
+MARKET ANALYSIS (from MARKET DATA):
+1. Market size and growth rates relevant to THIS specific product
+2. Key industry trends, regulatory and technological shifts affecting THIS product
+3. Opportunities, challenges and future outlook for THIS type of product
+
+COMPETITOR ANALYSIS (from COMPETITOR DATA):
+1. Identify real competitors (not hypothetical) and their positioning
+2. Assess pricing strategies and funding patterns
+3. Find differentiation opportunities and market gaps THIS product can fill
+- All arrays must have 2-5 meaningful, product-specific items
+- Company names must be real competitors, not fabricated
+
+CUSTOMER INSIGHTS (from CUSTOMER DATA):
+1. Pain points and unmet needs THIS product could address
+2. Customer expectations, sentiment and requested features for THIS type of product
+- Pain points must include: issue, frequency (High/Medium/Low), impact (High/Medium/Low), description
+- Customer segments must include: name, demographics, characteristics, needs
+"""
+
+COMBINED_ANALYZER_SCHEMA = (
+    '\n{{\n    "market": ' + MARKET_ANALYZER_SCHEMA.strip()
+    + ',\n    "competitor": ' + COMPETITOR_ANALYZER_SCHEMA.strip()
+    + ',\n    "customer": ' + CUSTOMER_INSIGHTS_SCHEMA.strip()
+    + '\n}}\n'
+)
+
+_render_combined_analyzer_system = compile_system_prompt(
+    role="market research, competitive intelligence and customer experience analyst",
+    specific_instructions=COMBINED_ANALYZER_SPECIFIC_INSTRUCTIONS,
+    schema=COMBINED_ANALYZER_SCHEMA
+)
+
+@lru_cache(maxsize=128)
+def get_combined_analyzer_system_prompt(product_idea: str) -> str:
+    """Generate the combined analyzer system prompt with 7 data analysis guardrails"""
+    return _render_combined_analyzer_system(product_idea=product_idea)
+
+COMBINED_ANALYZER_ANALYSIS_HUMAN = """
+Product Idea: "{product_idea}"
+Sector: {sector}
+
+Perform a combined market, competitor and customer analysis for the product idea above.
+
+MARKET DATA:
+{market_data}
+
+COMPETITOR DATA:
+{competitor_data}
+
+CUSTOMER DATA:
+{customer_data}
+
+Return one JSON object with "market", "competitor" and "customer" keys in the specified format.
+"""
+_render_combined_analyzer_analysis_human = compile_template(COMBINED_ANALYZER_ANALYSIS_HUMAN)
 
 
 # =============================================================================
@@ -469,7 +596,6 @@ SYNTHESIS APPROACH:
 
 CITATION AGGREGATION:
 - Collect all citations from the three agent analyses (market, competitor, customer)
-- Deduplicate citations by URL (keep the most comprehensive entry per URL)
 - Group by source_type: market_analysis, competitor_analysis, customer_insights
 - Consolidate insights from multiple citations per source if needed
 - Add source_type field to each citation based on which agent provided it
@@ -570,18 +696,23 @@ REPORT_GENERATOR_SCHEMA = """
 }}
 """
 
+# Only the specific instructions vary per request; the guardrails around them are built once
+_REPORT_SYSTEM_HEAD, _REPORT_SYSTEM_TAIL = build_system_prompt_with_guardrails(
+    role="senior market research analyst",
+    specific_instructions="\0",
+    schema=REPORT_GENERATOR_SCHEMA
+).split("\0")
+_render_report_instructions = compile_template(REPORT_GENERATOR_SPECIFIC_INSTRUCTIONS)
+
+@lru_cache(maxsize=128)
 def get_report_generator_system_prompt(sector: str, product_context: str, product_idea: str) -> str:
     """Generate Report Generator system prompt with 7 data analysis guardrails"""
-    instructions = REPORT_GENERATOR_SPECIFIC_INSTRUCTIONS.format(
+    instructions = _render_report_instructions(
         sector=sector,
         product_context=product_context
     )
 
-    return build_system_prompt_with_guardrails(
-        role="senior market research analyst",
-        specific_instructions=instructions,
-        schema=REPORT_GENERATOR_SCHEMA
-    )
+    return _REPORT_SYSTEM_HEAD + instructions + _REPORT_SYSTEM_TAIL
 
 REPORT_GENERATOR_HUMAN = """
 Product Idea: "{product_idea}"
@@ -605,13 +736,15 @@ DATA SOURCES SUMMARY:
 - Total Sources Analyzed: {total_count}
 
 IMPORTANT: Each analysis above includes a "citations" array with source attributions.
-Extract these citations, deduplicate by URL, add source_type field (market_analysis/competitor_analysis/customer_insights),
+Extract these citations, add source_type field (market_analysis/competitor_analysis/customer_insights),
 and include them in your final report's citations array.
 
 Synthesize this data into a professional, actionable report in the specified JSON format.
 Provide specific, data-driven recommendations focused on Product-Market Fit opportunities.
 """
 
+_render_report_human = compile_template(REPORT_GENERATOR_HUMAN)
+
 
 # =============================================================================
 # HELPER FUNCTIONS FOR PROMPT FORMATTING
@@ -619,15 +752,15 @@ Provide specific, data-driven recommendations focused on Product-Market Fit oppo
 
 def format_orchestrator_parse_prompt(product_idea: str) -> tuple[str, str]:
     return (
-        get_orchestrator_system_prompt(),
-        ORCHESTRATOR_PRODUCT_IDEA_HUMAN.format(product_idea=product_idea)
+        _ORCHESTRATOR_SYSTEM_PROMPT,
+        _render_orchestrator_human(product_idea=product_idea)
     )
 
 
 def format_market_analyzer_analysis_prompt(product_idea: str, sector: str, market_data: str) -> tuple[str, str]:
     return (
         get_market_analyzer_system_prompt(product_idea),
-        MARKET_ANALYZER_ANALYSIS_HUMAN.format(
+        _render_market_analyzer_analysis_human(
             product_idea=product_idea,
             sector=sector,
             market_data=market_data
@@ -638,7 +771,7 @@ def format_market_analyzer_analysis_prompt(product_idea: str, sector: str, marke
 def format_competitor_analyzer_analysis_prompt(product_idea: str, sector: str, competitor_data: str) -> tuple[str, str]:
     return (
         get_competitor_analyzer_system_prompt(product_idea),
-        COMPETITOR_ANALYZER_ANALYSIS_HUMAN.format(
+        _render_competitor_analyzer_analysis_human(
             product_idea=product_idea,
             sector=sector,
             competitor_data=competitor_data
@@ -649,9 +782,28 @@ def format_competitor_analyzer_analysis_prompt(product_idea: str, sector: str, c
 def format_customer_insights_analysis_prompt(product_idea: str, sector: str, customer_data: str) -> tuple[str, str]:
     return (
         get_customer_insights_system_prompt(product_idea),
-        CUSTOMER_INSIGHTS_ANALYSIS_HUMAN.format(
+        _render_customer_insights_analysis_human(
+            product_idea=product_idea,
+            sector=sector,
+            customer_data=customer_data
+        )
+    )
+
+
+def format_combined_analyzer_prompt(
+    product_idea: str,
+    sector: str,
+    market_data: str,
+    competitor_data: str,
+    customer_data: str
+) -> tuple[str, str]:
+    return (
+        get_combined_analyzer_system_prompt(product_idea),
+        _render_combined_analyzer_analysis_human(
             product_idea=product_idea,
             sector=sector,
+            market_data=market_data,
+            competitor_data=competitor_data,
             customer_data=customer_data
         )
     )
@@ -670,7 +822,7 @@ def format_report_generator_prompt(
     product_context = f' for the product idea: "{product_idea}"' if product_idea else ''
     system_prompt = get_report_generator_system_prompt(sector, product_context, product_idea)
 
-    human_prompt = REPORT_GENERATOR_HUMAN.format(
+    human_prompt = _render_report_human(
         product_idea=product_idea,
         sector=sector,
         market_analysis=market_analysis,
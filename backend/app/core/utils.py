@@ -1,90 +1,208 @@
 """
 Core Utilities - JSON extraction from LLM responses and content management
 """
-import re
+import asyncio
 import json
-from typing import List, Dict, Any
+import time
+import orjson
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime
+from typing import List, Dict, Any, Callable
 from .constants import MAX_CHARACTERS_PER_REQUEST
 
-def extract_json_from_response(text: str) -> str:
-    """Extract JSON from LLM response"""
-    # Try to find JSON in code blocks first
-    json_pattern = r'```json\s*(.*?)\s*```'
-    match = re.search(json_pattern, text, re.DOTALL)
-    if match:
-        return match.group(1)
+# Bounded pool for CPU-heavy JSON work (large prompts and LLM responses)
+_JSON_POOL = ThreadPoolExecutor(max_workers=4, thread_name_prefix="json")
+
+async def run_json_task(func: Callable[..., Any], *args: Any) -> Any:
+    """Run a JSON serialize/parse step in the JSON pool so the event loop keeps serving other requests"""
+    return await asyncio.get_running_loop().run_in_executor(_JSON_POOL, func, *args)
+
+# (epoch second, formatted timestamp) of the last now_iso() call
+_last_timestamp = (0, "")
+
+def now_iso() -> str:
+    """Local ISO-8601 timestamp at second resolution, formatted at most once per second"""
+    global _last_timestamp
+    second = int(time.time())
+    cached_second, formatted = _last_timestamp
+    if second != cached_second:
+        formatted = datetime.fromtimestamp(second).isoformat()
+        _last_timestamp = (second, formatted)
+    return formatted
+
+# Marks a JSON candidate that has not been parsed yet
+_UNPARSED = object()
+
+# raw_decode (C scanner) parses one JSON value from an offset and reports where it ended
+_JSON_DECODER = json.JSONDecoder()
+
+def _json_candidate(text: str) -> tuple[str, Any]:
+    """JSON text in an LLM response and its parsed value, or _UNPARSED if it was not parsed"""
+    # JSON-mode responses are already a bare object
+    if text.startswith('{') and text.endswith('}'):
+        return text, _UNPARSED
     
-    # Try to find JSON in any code block
-    json_pattern = r'```\s*(.*?)\s*```'
-    match = re.search(json_pattern, text, re.DOTALL)
-    if match:
+    # Code fences, found with str.find instead of a backtracking regex: ```json first, then any fence
+    json_fence = text.find('```json')
+    if json_fence != -1:
+        body_end = text.find('```', json_fence + 7)
+        if body_end != -1:
+            return text[json_fence + 7:body_end].strip(), _UNPARSED
+    
+    fence = text.find('```')
+    if fence != -1:
+        body_end = text.find('```', fence + 3)
+        if body_end != -1:
+            body = text[fence + 3:body_end].strip()
+            # Only a body that opens like JSON is worth parsing (a language tag or prose cannot be);
+            # the parse validates it and its value is handed on so it is not parsed twice
+            if body[:1] in ('{', '['):
+                try:
+                    return body, orjson.loads(body)
+                except orjson.JSONDecodeError:
+                    pass
+    
+    # The object opening at the first {: decoded forward, so it ends at its own closing brace
+    # and any trailing prose (even with braces in it) is left out
+    start_idx = text.find('{')
+    if start_idx != -1:
         try:
-            json.loads(match.group(1))
-            return match.group(1)
+            parsed, end_idx = _JSON_DECODER.raw_decode(text, start_idx)
+            return text[start_idx:end_idx], parsed
         except json.JSONDecodeError:
             pass
     
-    # Find first { to last }
-    start_idx = text.find('{')
+    # Not a complete object: first { to last }
     end_idx = text.rfind('}')
     if start_idx != -1 and end_idx != -1 and end_idx > start_idx:
-        return text[start_idx:end_idx + 1]
+        return text[start_idx:end_idx + 1], _UNPARSED
     
-    return text
+    return text, _UNPARSED
 
-def truncate_content_for_llm(content: str, max_chars: int = MAX_CHARACTERS_PER_REQUEST) -> str:
-    """Truncate content to fit within OpenAI token limits"""
-    if len(content) <= max_chars:
-        return content
+def load_json_from_response(text: str) -> tuple[Any, str]:
+    """Parse the JSON in an LLM response; returns the parsed value and the JSON text it came from.
     
-    # Truncate and add truncation notice
-    truncation_notice = f"\n\n[Content truncated - original: {len(content)} chars]"
-    available_chars = max_chars - len(truncation_notice)
-    truncated = content[:available_chars]
-    return f"{truncated}{truncation_notice}"
+    Raises orjson.JSONDecodeError if the extracted text is not valid JSON.
+    """
+    json_text, parsed = _json_candidate(text)
+    if parsed is _UNPARSED:
+        parsed = orjson.loads(json_text)
+    return parsed, json_text
+
+def parse_json_response(text: str) -> Any:
+    """Parse the JSON in an LLM response, ignoring code fences or prose around it"""
+    return load_json_from_response(text)[0]
 
-def truncate_search_results(search_results: List[Dict[str, Any]], max_chars: int = MAX_CHARACTERS_PER_REQUEST) -> List[Dict[str, Any]]:
-    """Truncate search results to fit within token limits"""
-    if not search_results:
-        return search_results
+class JsonObjectScanner:
+    """Incrementally tracks brace depth over streamed text to detect when the top-level JSON object closes"""
     
-    # Calculate total content length efficiently
-    total_length = sum(len(result.get('content', '')) + 2 for result in search_results)  # +2 for newlines
+    __slots__ = ("depth", "in_string", "escaped", "started")
     
-    if total_length <= max_chars:
-        return search_results
+    def __init__(self) -> None:
+        self.depth = 0
+        self.in_string = False
+        self.escaped = False
+        self.started = False
     
-    # Truncate results to fit within limit
-    truncated_results = []
-    current_length = 0
+    def feed(self, text: str) -> bool:
+        """Consume the next chunk; return True once the outermost object is complete"""
+        for char in text:
+            if self.in_string:
+                if self.escaped:
+                    self.escaped = False
+                elif char == '\\':
+                    self.escaped = True
+                elif char == '"':
+                    self.in_string = False
+            elif char == '"':
+                if self.started:
+                    self.in_string = True
+            elif char == '{':
+                self.depth += 1
+                self.started = True
+            elif char == '}' and self.started:
+                self.depth -= 1
+                if self.depth == 0:
+                    return True
+        return False
+
+def serialize_search_results_for_llm(search_results: List[Dict[str, Any]], max_chars: int = MAX_CHARACTERS_PER_REQUEST) -> str:
+    """Select, truncate and serialize search results for an LLM prompt in a single pass.
+    
+    Produces a compact JSON array of {title, content, extracted_content, url} rows, skipping rows
+    without any content. The serialized size in UTF-8 bytes (the unit the tokenizer works on, and
+    never less than the length in characters) is kept within max_chars; the row that crosses the
+    limit is trimmed (extracted_content first, then content) and serialization stops there.
+    """
     truncation_notice = "\n[Content truncated due to length limits]"
-    notice_length = len(truncation_notice)
+    notice_length = len(orjson.dumps(truncation_notice)) - 2  # as it appears inside a JSON string
+    # Rows stay as the bytes orjson produces; the array is decoded once at the end
+    rows = []
+    current_length = 2  # enclosing brackets
     
     for result in search_results:
-        content = result.get('content', '')
-        if not content:
-            truncated_results.append(result)
+        content = result.get("content", "")
+        extracted_content = result.get("extracted_content", "")
+        if not (content or extracted_content):
             continue
         
-        # Calculate available space
-        remaining_chars = max_chars - current_length - notice_length
+        row = {
+            "title": result.get("title", ""),
+            "content": content,
+            "extracted_content": extracted_content,
+            "url": result.get("url", "")
+        }
+        separator_length = 1 if rows else 0
+        encoded = orjson.dumps(row)
+        overflow = current_length + separator_length + len(encoded) - max_chars
         
-        if remaining_chars <= 0:
-            # Add placeholder for truncated content
-            truncated_result = result.copy()
-            truncated_result['content'] = "[Content truncated due to length limits]"
-            truncated_results.append(truncated_result)
+        if overflow > 0:
+            # Trim this row to fit the remaining budget, then stop. Each character cut removes
+            # at least one byte, so cutting `overflow` characters always fits.
+            overflow += notice_length
+            for field in ("extracted_content", "content"):
+                cut = min(overflow, len(row[field]))
+                if cut:
+                    row[field] = row[field][:len(row[field]) - cut]
+                    overflow -= cut
+            if overflow > 0:
+                break
+            if row["extracted_content"]:
+                row["extracted_content"] += truncation_notice
+            else:
+                row["content"] += truncation_notice
+            rows.append(orjson.dumps(row))
             break
         
-        if len(content) <= remaining_chars:
-            # This result fits completely
-            truncated_results.append(result)
-            current_length += len(content) + 2  # +2 for newlines
-        else:
-            # Truncate this result
-            truncated_result = result.copy()
-            truncated_result['content'] = content[:remaining_chars] + truncation_notice
-            truncated_results.append(truncated_result)
-            break
+        rows.append(encoded)
+        current_length += separator_length + len(encoded)
+    
+    return (b"[" + b",".join(rows) + b"]").decode()
+
+def dedupe_citations(citations: List[Any]) -> List[Any]:
+    """Merge report citations that share a URL, in first-seen order.
+    
+    The first entry for a URL is kept and the key_insights of later entries for it are
+    appended to its own; entries without a URL are kept as they are.
+    """
+    by_url: Dict[str, Dict[str, Any]] = {}
+    deduped = []
+    for citation in citations:
+        url = citation.get("url") if isinstance(citation, dict) else None
+        if not url:
+            deduped.append(citation)
+            continue
+        
+        kept = by_url.get(url)
+        if kept is None:
+            by_url[url] = citation
+            deduped.append(citation)
+            continue
+        
+        insights = citation.get("key_insights")
+        if isinstance(insights, list) and insights:
+            merged = kept.get("key_insights")
+            merged = merged if isinstance(merged, list) else []
+            kept["key_insights"] = merged + [insight for insight in insights if insight not in merged]
     
-    return truncated_results
+    return deduped
@@ -1,8 +1,7 @@
 """
 Database Factory - Provides appropriate database connections based on context
 """
-import logging
-from typing import Optional, Union
+from contextvars import ContextVar
 from enum import Enum
 from app.db.postgres_manager import postgres_manager
 from app.db.mongodb_manager import mongodb_manager
@@ -16,36 +15,52 @@ class DatabaseContext(Enum):
     FASTAPI = "fastapi"  # Async operations for FastAPI
     CELERY = "celery"    # Sync operations for Celery workers
 
+_FASTAPI = DatabaseContext.FASTAPI
+
+# Context chosen by fastapi_context()/celery_context() for the current thread or asyncio task.
+# Unset outside of those blocks, where the factory's process-wide default applies.
+_scoped_context: ContextVar[DatabaseContext] = ContextVar("database_context")
+
 class DatabaseFactory:
     """Factory for providing appropriate database connections based on context"""
     
+    __slots__ = ("default_context",)
+    
     def __init__(self):
-        self.context = DatabaseContext.FASTAPI  # Default to FastAPI context
+        self.default_context = DatabaseContext.FASTAPI  # Default to FastAPI context
+    
+    @property
+    def context(self) -> DatabaseContext:
+        """Database context in effect for the caller"""
+        return _scoped_context.get(self.default_context)
     
     def set_context(self, context: DatabaseContext):
-        """Set the current database context"""
-        self.context = context
+        """Set the process-wide database context (overridden inside fastapi_context()/celery_context())"""
+        self.default_context = context
     
     def get_postgres_session(self):
         """Get PostgreSQL session based on context"""
-        if self.context == DatabaseContext.FASTAPI:
+        if _scoped_context.get(self.default_context) is _FASTAPI:
             return postgres_manager.get_session()
-        else:  # CELERY
-            return postgres_manager.get_sync_session()
+        return postgres_manager.get_sync_session()
     
     def get_mongodb_collection(self, collection_name: str):
         """Get MongoDB collection based on context"""
-        if self.context == DatabaseContext.FASTAPI:
+        if _scoped_context.get(self.default_context) is _FASTAPI:
             return mongodb_manager.get_collection(collection_name)
-        else:  # CELERY
-            return mongodb_manager.get_sync_collection(collection_name)
+        return mongodb_manager.get_sync_collection(collection_name)
+    
+    def get_mongodb_read_collection(self, collection_name: str):
+        """Get MongoDB collection for lag-tolerant reads (Celery reads stay on the sync client)"""
+        if _scoped_context.get(self.default_context) is _FASTAPI:
+            return mongodb_manager.get_read_collection(collection_name)
+        return mongodb_manager.get_sync_collection(collection_name)
     
     def get_redis_client(self):
         """Get Redis client based on context"""
-        if self.context == DatabaseContext.FASTAPI:
+        if _scoped_context.get(self.default_context) is _FASTAPI:
             return redis_manager.get_client()
-        else:  # CELERY
-            return redis_manager.get_sync_client()
+        return redis_manager.get_sync_client()
     
     def get_postgres_manager(self):
         """Get PostgreSQL manager for direct access"""
@@ -64,20 +79,23 @@ database_factory = DatabaseFactory()
 
 # Context managers for easy context switching
 class DatabaseContextManager:
-    """Context manager for database operations"""
+    """Context manager for database operations.
+    
+    The context is scoped to the current thread or asyncio task, so concurrent
+    requests and worker tasks never see each other's context.
+    """
     
     def __init__(self, context: DatabaseContext):
         self.context = context
-        self.previous_context = None
+        self._token = None
     
     def __enter__(self):
-        self.previous_context = database_factory.context
-        database_factory.set_context(self.context)
+        self._token = _scoped_context.set(self.context)
         return database_factory
     
     def __exit__(self, exc_type, exc_val, exc_tb):
-        if self.previous_context:
-            database_factory.set_context(self.previous_context)
+        _scoped_context.reset(self._token)
+        self._token = None
 
 # Convenience functions
 def fastapi_context():
@@ -1,17 +1,27 @@
-import logging
-from typing import Optional
-from pymongo import AsyncMongoClient, MongoClient
+from pymongo import AsyncMongoClient, MongoClient, ReadPreference
 from app.core.config import get_mongodb_url, get_logger
 
 logger = get_logger(__name__)
 
 class MongoDBManager:
+    
+    __slots__ = (
+        "client", "sync_client", "database", "sync_database", "read_database", "is_connected",
+        "_collections", "_sync_collections", "_read_collections"
+    )
+    
     def __init__(self):
         self.client = None
         self.sync_client = None
         self.database = None
         self.sync_database = None
+        # Same connection pool as `database`, but reads may be served by the nearest member
+        self.read_database = None
         self.is_connected = False
+        # Collection handles by name, reused across calls; cleared whenever the database changes
+        self._collections = {}
+        self._sync_collections = {}
+        self._read_collections = {}
     
     async def connect(self, mongodb_url: str):
         try:
@@ -30,12 +40,16 @@ class MongoDBManager:
                 maxConnecting=2                    # Very limited concurrent connections
             )
             self.database = self.client.get_default_database()
+            self.read_database = self.database.with_options(read_preference=ReadPreference.NEAREST)
+            self._collections.clear()
+            self._read_collections.clear()
             self.is_connected = True
             return True
         except Exception as e:
             logger.error(f"Failed to connect to MongoDB: {e}")
             self.client = None
             self.database = None
+            self.read_database = None
             self.is_connected = False
             return False
     
@@ -57,6 +71,7 @@ class MongoDBManager:
                 maxConnecting=2                    # Very limited concurrent connections
             )
             self.sync_database = self.sync_client.get_default_database()
+            self._sync_collections.clear()
             self.is_connected = True
             return True
         except Exception as e:
@@ -66,6 +81,9 @@ class MongoDBManager:
             return False
     
     async def close(self):
+        self._collections.clear()
+        self._sync_collections.clear()
+        self._read_collections.clear()
         if self.client:
             await self.client.close()
             self.is_connected = False
@@ -75,12 +93,27 @@ class MongoDBManager:
     def get_collection(self, collection_name: str):
         if self.database is None:
             raise Exception("MongoDB not connected")
-        return self.database[collection_name]
+        collection = self._collections.get(collection_name)
+        if collection is None:
+            collection = self._collections[collection_name] = self.database[collection_name]
+        return collection
+    
+    def get_read_collection(self, collection_name: str):
+        """Collection handle for reads that tolerate replication lag (listings, not status polling)"""
+        if self.read_database is None:
+            raise Exception("MongoDB not connected")
+        collection = self._read_collections.get(collection_name)
+        if collection is None:
+            collection = self._read_collections[collection_name] = self.read_database[collection_name]
+        return collection
     
     def get_sync_collection(self, collection_name: str):
         if self.sync_database is None:
             raise Exception("MongoDB sync not connected")
-        return self.sync_database[collection_name]
+        collection = self._sync_collections.get(collection_name)
+        if collection is None:
+            collection = self._sync_collections[collection_name] = self.sync_database[collection_name]
+        return collection
     
     async def ping(self) -> bool:
         try:
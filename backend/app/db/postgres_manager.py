@@ -1,41 +1,77 @@
+import asyncio
 import logging
-from typing import Optional
+from functools import lru_cache
+from urllib.parse import urlsplit, urlunsplit
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
 from sqlalchemy import create_engine, text
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker
-from app.core.config import get_database_url
+from app.core.config import get_database_url, get_settings
 
+# asyncpg's ssl= values as libpq sslmode= values; other values are already valid sslmodes
+_SSL_TO_SSLMODE = {
+    "require": "require",
+    "true": "require",
+    "false": "disable",
+    "prefer": "prefer",
+    "allow": "allow"
+}
+
+@lru_cache(maxsize=16)
 def convert_async_to_sync_url(database_url: str) -> str:
-    """Convert async PostgreSQL URL to sync URL for psycopg2 compatibility"""
+    """Convert async PostgreSQL URL to sync URL for the psycopg (3) driver"""
+    # A plain postgresql:// URL would select SQLAlchemy's default driver (psycopg2)
+    if database_url.startswith('postgresql://'):
+        return 'postgresql+psycopg://' + database_url[len('postgresql://'):]
     if not database_url.startswith('postgresql+asyncpg://'):
         return database_url
     
-    # Convert async URL to sync URL
-    sync_url = database_url.replace('postgresql+asyncpg://', 'postgresql://')
-    
-    # Convert SSL parameters for psycopg2 compatibility
-    if 'ssl=require' in sync_url:
-        sync_url = sync_url.replace('ssl=require', 'sslmode=require')
-    elif 'ssl=true' in sync_url:
-        sync_url = sync_url.replace('ssl=true', 'sslmode=require')
-    elif 'ssl=false' in sync_url:
-        sync_url = sync_url.replace('ssl=false', 'sslmode=disable')
+    # Parsed once: only the scheme and the query's ssl parameter change, so credentials and
+    # paths that happen to contain "ssl=" are never rewritten, and other parameters keep
+    # their original encoding
+    parts = urlsplit(database_url)
+    query = []
+    for pair in parts.query.split('&') if parts.query else ():
+        key, _, value = pair.partition('=')
+        if key == 'ssl':
+            pair = f"sslmode={_SSL_TO_SSLMODE.get(value.lower(), value)}"
+        query.append(pair)
     
-    # Handle other SSL variations
-    if 'ssl=prefer' in sync_url:
-        sync_url = sync_url.replace('ssl=prefer', 'sslmode=prefer')
-    elif 'ssl=allow' in sync_url:
-        sync_url = sync_url.replace('ssl=allow', 'sslmode=allow')
-    
-    return sync_url
+    return urlunsplit(('postgresql+psycopg', parts.netloc, parts.path, '&'.join(query), parts.fragment))
 
 logger = logging.getLogger(__name__)
 
+# libpq TCP keepalives for the psycopg client socket, so a sync connection stuck on a dead peer
+# errors out instead of hanging; stale pooled connections are caught by pool_pre_ping
+_SYNC_CONNECT_ARGS = {
+    "keepalives": 1,
+    "keepalives_idle": 60,
+    "keepalives_interval": 10,
+    "keepalives_count": 3
+}
+
+def _pool_options() -> dict:
+    """Pool sizing and checkout validation shared by the async and sync engines"""
+    settings = get_settings()
+    return {
+        "pool_size": settings.postgres_pool_size,
+        "max_overflow": settings.postgres_max_overflow,
+        "pool_timeout": settings.postgres_pool_timeout,
+        "pool_recycle": settings.postgres_pool_recycle,
+        "pool_pre_ping": settings.postgres_pool_pre_ping
+    }
+
 class PostgreSQLManager:
+    
+    __slots__ = (
+        "engine", "sync_engine", "SessionLocal", "readonly_SessionLocal", "sync_SessionLocal", "is_connected"
+    )
+    
     def __init__(self):
         self.engine = None
         self.sync_engine = None
         self.SessionLocal = None
+        self.readonly_SessionLocal = None
         self.sync_SessionLocal = None
         self.is_connected = False
     
@@ -43,26 +79,44 @@ class PostgreSQLManager:
         try:
             self.engine = create_async_engine(
                 database_url,
-                # Connection pool configuration (optimized for free tier)
-                pool_size=2,                     # Minimal connections for free tier
-                max_overflow=3,                  # Very limited additional connections
-                pool_pre_ping=True,              # Validate connections before use
-                pool_recycle=1800,               # Recycle connections every 30 minutes
-                pool_timeout=10,                 # Shorter timeout for free tier
-                echo=False                       # Set to True for SQL query logging
+                # Connection pool configuration (sized via POSTGRES_POOL_* settings)
+                poolclass=AsyncAdaptedQueuePool,
+                echo=False,                      # Set to True for SQL query logging
+                **_pool_options()
             )
             self.SessionLocal = async_sessionmaker(
                 bind=self.engine,
                 class_=AsyncSession,
                 expire_on_commit=False
             )
+            # Same pool; connections checked out through this engine run in AUTOCOMMIT
+            self.readonly_SessionLocal = async_sessionmaker(
+                bind=self.engine.execution_options(isolation_level="AUTOCOMMIT"),
+                class_=AsyncSession,
+                expire_on_commit=False
+            )
             self.is_connected = True
+            
+            if get_settings().postgres_prewarm:
+                await self._prewarm()
         except Exception as e:
             logger.error(f"Failed to connect to PostgreSQL: {e}")
             self.engine = None
             self.SessionLocal = None
+            self.readonly_SessionLocal = None
             self.is_connected = False
     
+    async def _prewarm(self):
+        """Open pool_size connections concurrently; a failure only costs the warm start"""
+        async def open_connection():
+            async with self.engine.connect() as conn:
+                await conn.execute(text("SELECT 1"))
+        
+        try:
+            await asyncio.gather(*(open_connection() for _ in range(get_settings().postgres_pool_size)))
+        except Exception as e:
+            logger.warning(f"PostgreSQL pool warm-up failed: {e}")
+    
     def connect_sync(self, database_url: str):
         """Connect to PostgreSQL synchronously (for Celery workers)"""
         try:
@@ -71,13 +125,10 @@ class PostgreSQLManager:
             
             self.sync_engine = create_engine(
                 sync_url,
-                # Connection pool configuration (optimized for free tier)
-                pool_size=2,                     # Minimal connections for free tier
-                max_overflow=3,                  # Very limited additional connections
-                pool_pre_ping=True,              # Validate connections before use
-                pool_recycle=1800,               # Recycle connections every 30 minutes
-                pool_timeout=10,                 # Shorter timeout for free tier
-                echo=False                       # Set to True for SQL query logging
+                # Connection pool configuration (sized via POSTGRES_POOL_* settings)
+                connect_args=_SYNC_CONNECT_ARGS,
+                echo=False,                      # Set to True for SQL query logging
+                **_pool_options()
             )
             self.sync_SessionLocal = sessionmaker(
                 bind=self.sync_engine,
@@ -103,6 +154,16 @@ class PostgreSQLManager:
             raise Exception("PostgreSQL not connected")
         return self.SessionLocal()
     
+    def get_readonly_session(self):
+        """Session for code paths that only SELECT.
+        
+        Statements run in AUTOCOMMIT, so no BEGIN/COMMIT round trips are sent around them.
+        Nothing written through this session is rolled back on error.
+        """
+        if not self.readonly_SessionLocal:
+            raise Exception("PostgreSQL not connected")
+        return self.readonly_SessionLocal()
+    
     def get_sync_session(self):
         if not self.sync_SessionLocal:
             raise Exception("PostgreSQL sync not connected")
@@ -1,11 +1,46 @@
+import asyncio
 import logging
 from typing import Optional
 import redis.asyncio as redis
 import redis as redis_sync
+from redis.asyncio.retry import Retry as AsyncRetry
+from redis.backoff import ExponentialBackoff
+from redis.retry import Retry
+from redis.utils import HIREDIS_AVAILABLE
 from app.core.config import get_redis_url
 
 logger = logging.getLogger(__name__)
 
+# redis-py uses the C hiredis reply parser when it is installed (redis[hiredis]) and falls back
+# to its pure-Python parser otherwise
+if not HIREDIS_AVAILABLE:
+    logger.warning("hiredis not installed; Redis replies will be parsed in pure Python")
+
+# Seconds a command waits for a free pooled connection
+_POOL_TIMEOUT = 1.0
+
+def _client_options(retry_class: type) -> dict:
+    """Connection pool configuration shared by the async (FastAPI) and sync (Celery) clients.
+    
+    Built per client, with the client's own Retry class (redis.retry or redis.asyncio.retry).
+    redis.asyncio re-exports the sync client's exception classes, so one error list suits both.
+    Passed to BlockingConnectionPool.from_url: a caller that finds every connection in use waits
+    up to _POOL_TIMEOUT for one to be returned instead of failing with "Too many connections".
+    """
+    return {
+        "max_connections": 2,                 # Very small pool for cloud Redis
+        # Up to 3 retries with exponential backoff (50ms base, 1s cap) instead of one immediate retry
+        "retry": retry_class(ExponentialBackoff(cap=1.0, base=0.05), retries=3),
+        "socket_keepalive": True,             # Enable TCP keepalive
+        "socket_keepalive_options": {},       # TCP keepalive options
+        "socket_connect_timeout": 5,          # Longer connection timeout for cloud
+        "socket_timeout": 5,                  # Longer socket timeout for cloud
+        "health_check_interval": 120,         # Less frequent health checks
+        "decode_responses": True,             # Automatically decode responses
+        "encoding": "utf-8",                  # Default encoding
+        "retry_on_error": [redis_sync.ConnectionError, redis_sync.TimeoutError]  # Retry on these errors
+    }
+
 class RedisManager:
     def __init__(self):
         self.client = None
@@ -19,20 +54,10 @@ class RedisManager:
             
         try:
             # Create async client (optimized for Redis Cloud)
-            self.client = redis.from_url(
-                redis_url,
-                # Connection pool configuration (optimized for Redis Cloud)
-                max_connections=2,                # Very small pool for cloud Redis
-                retry_on_timeout=True,             # Retry operations on timeout
-                socket_keepalive=True,             # Enable TCP keepalive
-                socket_keepalive_options={},       # TCP keepalive options
-                socket_connect_timeout=5,          # Longer connection timeout for cloud
-                socket_timeout=5,                  # Longer socket timeout for cloud
-                health_check_interval=120,        # Less frequent health checks
-                decode_responses=True,             # Automatically decode responses
-                encoding='utf-8',                  # Default encoding
-                retry_on_error=[redis.ConnectionError, redis.TimeoutError]  # Retry on these errors
+            pool = redis.BlockingConnectionPool.from_url(
+                redis_url, timeout=_POOL_TIMEOUT, **_client_options(AsyncRetry)
             )
+            self.client = redis.Redis.from_pool(pool)
             await self.client.ping()
             self.is_connected = True
             return True
@@ -50,20 +75,10 @@ class RedisManager:
             
         try:
             # Create sync client (optimized for Redis Cloud)
-            self.sync_client = redis_sync.from_url(
-                redis_url,
-                # Connection pool configuration (optimized for Redis Cloud)
-                max_connections=2,                # Very small pool for cloud Redis
-                retry_on_timeout=True,             # Retry operations on timeout
-                socket_keepalive=True,             # Enable TCP keepalive
-                socket_keepalive_options={},       # TCP keepalive options
-                socket_connect_timeout=5,          # Longer connection timeout for cloud
-                socket_timeout=5,                  # Longer socket timeout for cloud
-                health_check_interval=120,        # Less frequent health checks
-                decode_responses=True,             # Automatically decode responses
-                encoding='utf-8',                  # Default encoding
-                retry_on_error=[redis_sync.ConnectionError, redis_sync.TimeoutError]  # Retry on these errors
+            pool = redis_sync.BlockingConnectionPool.from_url(
+                redis_url, timeout=_POOL_TIMEOUT, **_client_options(Retry)
             )
+            self.sync_client = redis_sync.Redis.from_pool(pool)
             self.sync_client.ping()
             self.is_connected = True
             return True
@@ -74,8 +89,11 @@ class RedisManager:
     
     async def close(self):
         if self.client:
-            await self.client.close()
+            await self.client.aclose()
             self.is_connected = False
+        if self.sync_client:
+            # Blocking socket shutdown, kept off the event loop
+            await asyncio.to_thread(self.sync_client.close)
     
     def get_client(self):
         return self.client
@@ -20,7 +20,7 @@ class MockChatOpenAI:
         # Import comprehensive mock responses
         from app.mocks.comprehensive_mock_responses import comprehensive_mock_responses
         self.mock_responses = comprehensive_mock_responses
-        
+    
     def invoke(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """Mock invoke method that returns realistic responses"""
         return self._process_messages(messages, **kwargs)
@@ -29,6 +29,17 @@ class MockChatOpenAI:
         """Mock async invoke method that returns realistic responses"""
         return self._process_messages(messages, **kwargs)
     
+    async def astream(self, messages: List[Dict[str, str]], **kwargs):
+        """Mock streaming method that yields the response in small chunks"""
+        response = self._process_messages(messages, **kwargs)
+        
+        class MockChunk:
+            def __init__(self, content: str):
+                self.content = content
+        
+        for start in range(0, len(response.content), 64):
+            yield MockChunk(response.content[start:start + 64])
+    
     def _process_messages(self, messages: List[Dict[str, str]], **kwargs) -> Dict[str, Any]:
         """Process messages and return mock response based on comprehensive mock data"""
         self.call_count += 1
@@ -89,8 +100,16 @@ class MockChatOpenAI:
         detected_keywords = [k for k in ['report', 'summary', 'final', 'conclusion', 'comprehensive', 'product-market fit'] if k in user_message_lower]
         logger.info(f"[MOCK] Processing message with keywords: {detected_keywords}")
         
+        # Combined market + competitor + customer analysis (checked first: it mentions all three)
+        if "combined market, competitor and customer analysis" in user_message_lower:
+            return json.dumps({
+                "market": self.mock_responses.get_mock_market_analysis(),
+                "competitor": self.mock_responses.get_mock_competitor_analysis(),
+                "customer": self.mock_responses.get_mock_customer_analysis()
+            }, indent=2)
+        
         # Research plan and initialization
-        if any(keyword in user_message_lower for keyword in ["research plan", "initialization", "workflow", "product idea", "generate 3 search queries", "validate this input"]):
+        elif any(keyword in user_message_lower for keyword in ["research plan", "initialization", "workflow", "product idea", "generate 3 search queries", "validate this input"]):
             plan_data = self.mock_responses.get_mock_research_plan()
             return json.dumps(plan_data, indent=2)
         
@@ -27,7 +27,7 @@ class CreditRepository:
             
             with fastapi_context():
                 postgres_manager = database_factory.get_postgres_manager()
-                async with postgres_manager.get_session() as session:
+                async with postgres_manager.get_readonly_session() as session:
                     from sqlalchemy import select
                     result = await session.execute(
                         select(CreditBalance).filter(
@@ -68,23 +68,23 @@ class TaskRepository:
                          status: Optional[str] = None) -> Dict[str, Any]:
         try:
             with fastapi_context():
-                collection = self.database_factory.get_mongodb_collection("tasks")
+                # A listing can be a moment behind the primary, so it may read from the nearest member
+                collection = self.database_factory.get_mongodb_read_collection("tasks")
             
             # Always exclude deleted tasks
             query = {"deleted": {"$ne": True}}
             if status:
                 query["status"] = status
             
-            # Get total count for pagination
-            total_count = await collection.count_documents(query)
-            
-            # Get paginated results
+            # Total count for pagination and the page itself are independent reads, run concurrently
             cursor = collection.find(query).sort("started_at", -1).skip((page - 1) * page_size).limit(page_size)
-            tasks = []
+            total_count, tasks = await asyncio.gather(
+                collection.count_documents(query),
+                cursor.to_list(length=page_size)
+            )
             
-            async for task in cursor:
+            for task in tasks:
                 task["_id"] = str(task["_id"])
-                tasks.append(task)
             
             # Calculate total pages
             total_pages = (total_count + page_size - 1) // page_size if total_count > 0 else 1
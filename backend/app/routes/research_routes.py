@@ -6,10 +6,11 @@ from fastapi import APIRouter, HTTPException
 from app.services.research_service import research_service
 from app.repositories.task_repository import task_repository
 from app.core.constants import TOTAL_CHECKPOINTS
-from app.core.config import settings
+from app.core.config import get_settings
 from app.db.redis_manager import redis_manager
 from app.schemas.research_schemas import (
-    ResearchRequest, ResearchResponse, ResearchStatus, ResearchResult,
+    ResearchRequest, ResearchResponse, ResearchBatchRequest, ResearchBatchResponse,
+    ResearchStatus, ResearchResult,
     SearchesRemaining, TaskList, TaskReport, TaskAction, CreditAddition
 )
 
@@ -22,7 +23,7 @@ HCAPTCHA_VERIFY_URL = "https://hcaptcha.com/siteverify"
 
 async def verify_hcaptcha(hcaptcha_response: str) -> bool:
     """Verify hCaptcha response with hCaptcha API"""
-    if not settings.hcaptcha_secret:
+    if not get_settings().hcaptcha_secret:
         logger.error("hcaptcha_secret not found in configuration")
         return False
         
@@ -31,7 +32,7 @@ async def verify_hcaptcha(hcaptcha_response: str) -> bool:
             response = await client.post(
                 HCAPTCHA_VERIFY_URL,
                 data={
-                    "secret": settings.hcaptcha_secret,
+                    "secret": get_settings().hcaptcha_secret,
                     "response": hcaptcha_response
                 }
             )
@@ -52,7 +53,7 @@ async def submit_market_research(
         if not request.auth_key:
             raise HTTPException(status_code=400, detail="Auth key required")
         
-        if request.auth_key != settings.auth_key:
+        if request.auth_key != get_settings().auth_key:
             raise HTTPException(status_code=401, detail="Invalid auth key")
         
         # Verify hCaptcha - now mandatory
@@ -79,6 +80,43 @@ async def submit_market_research(
         logger.error(f"Error submitting research request: {e}")
         raise HTTPException(status_code=500, detail=f"Failed to submit research request: {str(e)}")
 
+@research_router.post("/batch", response_model=ResearchBatchResponse)
+async def submit_market_research_batch(
+    request: ResearchBatchRequest,
+    user_id: str = "default"
+) -> ResearchBatchResponse:
+    """Submit several market research requests with one auth and captcha check"""
+    try:
+        # Verify auth key - mandatory
+        if not request.auth_key:
+            raise HTTPException(status_code=400, detail="Auth key required")
+        
+        if request.auth_key != get_settings().auth_key:
+            raise HTTPException(status_code=401, detail="Invalid auth key")
+        
+        # Verify hCaptcha - now mandatory
+        if not request.hcaptcha_response:
+            raise HTTPException(status_code=400, detail="Captcha verification required")
+        
+        is_valid = await verify_hcaptcha(request.hcaptcha_response)
+        if not is_valid:
+            raise HTTPException(status_code=400, detail="Invalid captcha verification")
+        
+        results = await research_service.submit_research_batch(
+            product_ideas=request.product_ideas,
+            research_depth=request.research_depth,
+            user_id=user_id
+        )
+        return ResearchBatchResponse(requests=[ResearchResponse(**result) for result in results])
+        
+    except HTTPException:
+        raise
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except Exception as e:
+        logger.error(f"Error submitting research batch: {e}")
+        raise HTTPException(status_code=500, detail=f"Failed to submit research batch: {str(e)}")
+
 @research_router.get("/result/{request_id}", response_model=ResearchResult)
 async def get_research_result(request_id: str) -> ResearchResult:
     """Get research result"""
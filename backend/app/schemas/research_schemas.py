@@ -1,7 +1,7 @@
 """
 Research Schemas - Pydantic models for API validation
 """
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from pydantic import BaseModel
 
 class ResearchRequest(BaseModel):
@@ -15,6 +15,15 @@ class ResearchResponse(BaseModel):
     status: str
     message: str
 
+class ResearchBatchRequest(BaseModel):
+    product_ideas: List[str]
+    research_depth: str = "standard"
+    hcaptcha_response: str
+    auth_key: str
+
+class ResearchBatchResponse(BaseModel):
+    requests: List[ResearchResponse]
+
 class ResearchStatus(BaseModel):
     request_id: str
     status: str
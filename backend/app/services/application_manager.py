@@ -1,9 +1,10 @@
 """
 Application Manager - Application startup, shutdown, and health monitoring
 """
+import asyncio
 import logging
 from typing import Dict, Any
-from app.core.config import get_logger, settings
+from app.core.config import get_logger, get_settings
 from app.db.database_factory import database_factory, fastapi_context
 from app.services.credit_service import credit_service
 
@@ -25,10 +26,13 @@ class ApplicationManager:
             self._validate_api_keys()
             logger.info("✅ API keys validated")
             
-            # Initialize services in order
-            await self._initialize_postgres()
-            await self._initialize_mongodb()
-            await self._initialize_redis()
+            # The three connections are independent, so they are opened concurrently;
+            # the credit service needs PostgreSQL and is initialized after them
+            await asyncio.gather(
+                self._initialize_postgres(),
+                self._initialize_mongodb(),
+                self._initialize_redis()
+            )
             await self._initialize_credit_service()
             
             self.services_initialized = True
@@ -42,17 +46,17 @@ class ApplicationManager:
     
     def _validate_api_keys(self):
         """Validate required API keys are present"""
-        if not settings.openai_api_key or not settings.tavily_api_key:
+        if not get_settings().openai_api_key or not get_settings().tavily_api_key:
             raise ValueError("Missing required API keys: OPENAI_API_KEY and TAVILY_API_KEY")
     
     async def _initialize_postgres(self):
         """Initialize PostgreSQL database"""
-        if not settings.postgres_url:
+        if not get_settings().postgres_url:
             raise ValueError("POSTGRES_URL is required")
         
         with fastapi_context():
             postgres_manager = database_factory.get_postgres_manager()
-            await postgres_manager.connect(settings.postgres_url)
+            await postgres_manager.connect(get_settings().postgres_url)
             if not postgres_manager.is_connected:
                 raise RuntimeError("Failed to connect to PostgreSQL")
             logger.info("✅ PostgreSQL connected")
@@ -71,12 +75,12 @@ class ApplicationManager:
     
     async def _initialize_mongodb(self):
         """Initialize MongoDB connection"""
-        if not settings.mongodb_url:
+        if not get_settings().mongodb_url:
             raise ValueError("MONGODB_URL is required")
         
         with fastapi_context():
             mongodb_manager = database_factory.get_mongodb_manager()
-            success = await mongodb_manager.connect(settings.mongodb_url)
+            success = await mongodb_manager.connect(get_settings().mongodb_url)
             if not success:
                 raise RuntimeError("Failed to connect to MongoDB")
             logger.info("✅ MongoDB connected")
@@ -84,12 +88,12 @@ class ApplicationManager:
     
     async def _initialize_redis(self):
         """Initialize Redis connection"""
-        if not settings.redis_url:
+        if not get_settings().redis_url:
             raise ValueError("REDIS_URL is required")
         
         with fastapi_context():
             redis_manager = database_factory.get_redis_manager()
-            await redis_manager.connect(settings.redis_url)
+            await redis_manager.connect(get_settings().redis_url)
             if not redis_manager.is_connected:
                 raise RuntimeError("Failed to connect to Redis")
             logger.info("✅ Redis connected")
@@ -121,6 +125,13 @@ class ApplicationManager:
                 cleanup_errors.append(f"Redis cleanup error: {e}")
                 logger.error(f"Error closing Redis: {e}")
         
+        try:
+            from app.core.ai_client import close_llm_http_clients
+            await close_llm_http_clients()
+        except Exception as e:
+            cleanup_errors.append(f"LLM HTTP client cleanup error: {e}")
+            logger.error(f"Error closing LLM HTTP clients: {e}")
+        
         if cleanup_errors:
             logger.warning(f"Service cleanup completed with {len(cleanup_errors)} errors")
         else:
@@ -132,8 +143,8 @@ class ApplicationManager:
             "mongodb": self._check_mongodb(),
             "postgresql": self._check_postgresql(),
             "redis": self._check_redis(),
-            "openai": "configured" if settings.openai_api_key else "not_configured",
-            "tavily": "configured" if settings.tavily_api_key else "not_configured"
+            "openai": "configured" if get_settings().openai_api_key else "not_configured",
+            "tavily": "configured" if get_settings().tavily_api_key else "not_configured"
         }
     
     def _check_mongodb(self) -> str:
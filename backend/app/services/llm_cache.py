@@ -0,0 +1,120 @@
+"""
+LLM Response Cache - Exact-prompt cache for deterministic LLM calls (query planning, agent analyses, report generation)
+Uses the sync Redis client so it works the same way inside Celery workers
+"""
+import asyncio
+import hashlib
+from typing import Any, Callable, Dict, Optional, Tuple
+
+from langchain_core.messages import HumanMessage, SystemMessage
+
+from app.db.redis_manager import redis_manager
+from app.core.config import get_logger
+from app.core.ai_client import astream_json_object
+from app.core.constants import LLM_CACHE_TTL_SECONDS
+from app.core.utils import run_json_task
+
+logger = get_logger(__name__)
+
+class LLMResponseCache:
+    """Caches raw LLM response text keyed by a SHA-256 of the model and the full prompt"""
+    
+    def __init__(self):
+        self.redis = redis_manager
+        # LLM calls currently running, by cache key; concurrent identical prompts share one call
+        self._in_flight: Dict[str, asyncio.Task] = {}
+    
+    def make_key(self, namespace: str, model: str, system_prompt: str, human_prompt: str) -> str:
+        """Build the Redis key for a prompt"""
+        digest = hashlib.sha256(
+            "\0".join((model, system_prompt, human_prompt)).encode()
+        ).hexdigest()
+        return f"llm_cache:{namespace}:{digest}"
+    
+    def get(self, key: str) -> Optional[str]:
+        """Get a cached response (sync version)"""
+        try:
+            redis_client = self.redis.get_sync_client()
+            if not redis_client:
+                return None
+            return redis_client.get(key)
+        except Exception as e:
+            logger.warning("LLM cache read failed for %s: %s", key, e)
+            return None
+    
+    def set(self, key: str, content: str, ttl: int = LLM_CACHE_TTL_SECONDS) -> bool:
+        """Store a response (sync version)"""
+        try:
+            redis_client = self.redis.get_sync_client()
+            if not redis_client:
+                return False
+            redis_client.setex(key, ttl, content)
+            return True
+        except Exception as e:
+            logger.warning("LLM cache write failed for %s: %s", key, e)
+            return False
+    
+    async def ainvoke_parsed(
+        self,
+        llm: Any,
+        namespace: str,
+        system_prompt: str,
+        human_prompt: str,
+        parse: Callable[[str], Any],
+        request_id: str = "unknown"
+    ) -> Any:
+        """Return parse(response) for the prompt, calling the LLM only on a cache miss.
+        
+        The response is cached only after it parses, so a malformed answer is never replayed.
+        Identical prompts arriving while a call is running wait for that call instead of
+        issuing their own. Parse errors and LLM errors propagate to the caller.
+        """
+        model = getattr(llm, "model_name", "") or ""
+        key = self.make_key(namespace, model, system_prompt, human_prompt)
+        
+        cached = await asyncio.to_thread(self.get, key)
+        if cached is not None:
+            try:
+                parsed = await run_json_task(parse, cached)
+                logger.info("[%s] LLM cache hit (%s)", request_id, namespace)
+                return parsed
+            except Exception as e:
+                logger.warning("[%s] Discarding unparseable cached response (%s): %s", request_id, namespace, e)
+        
+        task = self._in_flight.get(key)
+        if task is not None and task.get_loop() is asyncio.get_running_loop():
+            logger.info("[%s] Joining in-flight LLM call (%s)", request_id, namespace)
+            content, _ = await asyncio.shield(task)
+            return await run_json_task(parse, content)
+        
+        task = asyncio.create_task(self._invoke_and_store(llm, key, system_prompt, human_prompt, parse))
+        self._in_flight[key] = task
+        task.add_done_callback(lambda done: self._forget(key, done))
+        
+        # Shielded so a cancelled caller does not cancel the call for the others waiting on it
+        _, parsed = await asyncio.shield(task)
+        return parsed
+    
+    async def _invoke_and_store(
+        self,
+        llm: Any,
+        key: str,
+        system_prompt: str,
+        human_prompt: str,
+        parse: Callable[[str], Any]
+    ) -> Tuple[str, Any]:
+        content = await astream_json_object(llm, [
+            SystemMessage(content=system_prompt),
+            HumanMessage(content=human_prompt)
+        ])
+        
+        parsed = await run_json_task(parse, content)
+        await asyncio.to_thread(self.set, key, content)
+        return content, parsed
+    
+    def _forget(self, key: str, task: asyncio.Task) -> None:
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+
+# Global LLM response cache instance
+llm_response_cache = LLMResponseCache()
@@ -2,14 +2,16 @@
 Progress Tracker - Tracks research workflow checkpoints (Sync version for Celery workers)
 Uses Redis for all progress tracking to avoid async/sync conflicts
 """
+import asyncio
 import logging
 from typing import Dict, Any, List, Optional
 from datetime import datetime
-import json
+
+import orjson
 
 from app.db.redis_manager import redis_manager
 from app.core.config import get_logger
-from app.core.constants import ALL_CHECKPOINTS, TOTAL_CHECKPOINTS
+from app.core.constants import ALL_CHECKPOINTS, TOTAL_CHECKPOINTS, CHECKPOINT_SET
 
 logger = get_logger(__name__)
 
@@ -18,15 +20,25 @@ class ProgressTracker:
     
     ALL_CHECKPOINTS = ALL_CHECKPOINTS
     TOTAL_CHECKPOINTS = TOTAL_CHECKPOINTS
+    CHECKPOINT_SET = CHECKPOINT_SET
     
     def __init__(self):
         self.redis = redis_manager
     
     def complete_checkpoint(self, request_id: str, checkpoint: str) -> bool:
         """Complete a checkpoint and update progress (sync version using Redis only)"""
+        return self.complete_checkpoints(request_id, [checkpoint])
+    
+    def complete_checkpoints(self, request_id: str, checkpoints: List[str]) -> bool:
+        """Complete several checkpoints at once; set and counter updates share one pipelined round trip"""
         try:
-            if checkpoint not in self.ALL_CHECKPOINTS:
-                logger.warning(f"Unknown checkpoint: {checkpoint}")
+            known_checkpoints = []
+            for checkpoint in checkpoints:
+                if checkpoint in self.CHECKPOINT_SET:
+                    known_checkpoints.append(checkpoint)
+                else:
+                    logger.warning(f"Unknown checkpoint: {checkpoint}")
+            if not known_checkpoints:
                 return False
             
             redis_client = self.redis.get_sync_client()
@@ -34,18 +46,19 @@ class ProgressTracker:
                 logger.error(f"[{request_id}] Redis sync client not available")
                 return False
             
-            # Step 1: Add checkpoint to Redis set
             checkpoints_key = f"checkpoints:{request_id}"
-            redis_client.sadd(checkpoints_key, checkpoint)
-            redis_client.expire(checkpoints_key, 3600)  # 1 hour TTL
-            
-            # Step 2: Increment counter
             counter_key = f"checkpoint_count:{request_id}"
-            completed_count = redis_client.incr(counter_key)
-            redis_client.expire(counter_key, 3600)
+            
+            # Step 1 + 2: Add checkpoints to Redis set and increment counter in one round trip
+            pipe = redis_client.pipeline(transaction=False)
+            pipe.sadd(checkpoints_key, *known_checkpoints)
+            pipe.expire(checkpoints_key, 3600)  # 1 hour TTL
+            pipe.incrby(counter_key, len(known_checkpoints))
+            pipe.expire(counter_key, 3600)
+            completed_count = pipe.execute()[2]
             
             total_checkpoints = self.TOTAL_CHECKPOINTS
-            logger.info(f"[{request_id}] Checkpoint {completed_count}/{total_checkpoints}: {checkpoint}")
+            logger.info(f"[{request_id}] Checkpoint {completed_count}/{total_checkpoints}: {', '.join(known_checkpoints)}")
             
             # Step 3: Update status with progress
             self._update_status_sync(request_id, {
@@ -58,9 +71,17 @@ class ProgressTracker:
             return True
             
         except Exception as e:
-            logger.error(f"[{request_id}] Failed to complete checkpoint {checkpoint}: {e}")
+            logger.error(f"[{request_id}] Failed to complete checkpoints {checkpoints}: {e}")
             return False
     
+    async def acomplete_checkpoint(self, request_id: str, checkpoint: str) -> bool:
+        """Complete a checkpoint from async code without blocking the event loop on Redis I/O"""
+        return await asyncio.to_thread(self.complete_checkpoint, request_id, checkpoint)
+    
+    async def acomplete_checkpoints(self, request_id: str, checkpoints: List[str]) -> bool:
+        """Async version of complete_checkpoints"""
+        return await asyncio.to_thread(self.complete_checkpoints, request_id, checkpoints)
+    
     def _update_status_sync(self, request_id: str, status_data: Dict[str, Any]) -> bool:
         """Update status in Redis cache (sync version)"""
         try:
@@ -73,12 +94,12 @@ class ProgressTracker:
             # Get existing status
             existing_status = redis_client.get(cache_key)
             if existing_status:
-                existing_data = json.loads(existing_status)
+                existing_data = orjson.loads(existing_status)
                 existing_data.update(status_data)
                 status_data = existing_data
             
             # Update cache (shorter TTL for cloud Redis)
-            redis_client.setex(cache_key, 300, json.dumps(status_data))  # 5 minutes
+            redis_client.setex(cache_key, 300, orjson.dumps(status_data))  # 5 minutes
             return True
             
         except Exception as e:
@@ -111,7 +132,7 @@ class ProgressTracker:
             }
             
             cache_key = f"status:{request_id}"
-            redis_client.setex(cache_key, 300, json.dumps(initial_status))  # 5 minutes
+            redis_client.setex(cache_key, 300, orjson.dumps(initial_status))  # 5 minutes
             
             logger.info(f"[{request_id}] Initialized progress tracking")
             return True
@@ -143,16 +164,19 @@ class ProgressTracker:
                 "last_updated": datetime.now().isoformat()
             }
             
+            status_json = orjson.dumps(final_status)
             if result:
-                final_status["result"] = result
+                # Serialize the (large) result once and splice it into the status object as "result"
+                result_json = orjson.dumps(result, option=orjson.OPT_NON_STR_KEYS)
+                status_json = status_json[:-1] + b',"result":' + result_json + b'}'
             
             cache_key = f"status:{request_id}"
-            redis_client.setex(cache_key, 300, json.dumps(final_status))  # 5 minutes
+            redis_client.setex(cache_key, 300, status_json)  # 5 minutes
             
             # Store final result separately for longer retention
             if result:
                 result_key = f"result:{request_id}"
-                redis_client.setex(result_key, 3600, json.dumps(result))  # 1 hour
+                redis_client.setex(result_key, 3600, result_json)  # 1 hour
             
             logger.info(f"[{request_id}] Task completed with status: {status}")
             return True
@@ -172,7 +196,7 @@ class ProgressTracker:
             status_data = redis_client.get(cache_key)
             
             if status_data:
-                return json.loads(status_data)
+                return orjson.loads(status_data)
             return None
             
         except Exception as e:
@@ -190,7 +214,7 @@ class ProgressTracker:
             result_data = redis_client.get(result_key)
             
             if result_data:
-                return json.loads(result_data)
+                return orjson.loads(result_data)
             return None
             
         except Exception as e:
@@ -1,13 +1,14 @@
 """
 Research Service - Business logic for research operations
 """
+import asyncio
 import logging
-from typing import Dict, Any, Optional
+from typing import Dict, Any, List, Optional
 from datetime import datetime
 
 from app.services.credit_service import credit_service
 from app.repositories.task_repository import task_repository
-from app.core.constants import TOTAL_CHECKPOINTS
+from app.core.constants import TOTAL_CHECKPOINTS, MAX_RESEARCH_BATCH_SIZE
 from app.worker.tasks import process_research_task
 from app.core.config import get_logger
 
@@ -59,46 +60,123 @@ class ResearchService:
             # Check and validate credits
             await self._validate_user_credits(user_id, credits_needed)
             
-            # Generate request ID
-            request_id = self._generate_request_id(product_idea)
+            return await self._create_and_dispatch(product_idea, research_depth, credits_needed, user_id)
             
-            # Create task data
-            task_data = {
-                "request_id": request_id,
-                "product_idea": product_idea,
-                "research_depth": research_depth,
-                "max_sources": 20,
-                "status": "pending",
-                "credits_required": credits_needed,
-                "user_id": user_id,
-                "started_at": datetime.now().isoformat(),
-                "created_at": datetime.now().isoformat(),
-                "completed_checkpoints": []  # Initialize as empty array
-            }
+        except Exception as e:
+            logger.error(f"Error submitting research request: {e}")
+            raise
+    
+    async def submit_research_batch(
+        self,
+        product_ideas: List[str],
+        research_depth: str,
+        user_id: str = "default"
+    ) -> List[Dict[str, Any]]:
+        """Submit several research requests at once; credits are validated once for the whole batch"""
+        try:
+            if research_depth not in self.credit_costs:
+                raise ValueError(f"Invalid research depth: {research_depth}")
             
-            # Save task to repository
-            await task_repository.create(task_data)
+            # Identical ideas in one batch would get the same request ID, so submit each once
+            product_ideas = list(dict.fromkeys(idea for idea in product_ideas if idea.strip()))
+            if not product_ideas:
+                raise ValueError("At least one product idea is required")
+            if len(product_ideas) > MAX_RESEARCH_BATCH_SIZE:
+                raise ValueError(f"Too many product ideas: at most {MAX_RESEARCH_BATCH_SIZE} per batch")
             
-            # Note: MongoDB text index will automatically index the task data
-            # No need for separate indexing service
+            credits_needed = self.credit_costs[research_depth]
+            await self._validate_user_credits(user_id, credits_needed * len(product_ideas))
             
-            # Submit to Celery worker
-            task = process_research_task.delay(
-                request_id=request_id,
-                product_idea=product_idea,
-                research_depth=research_depth
-            )
+            # Every task is saved before any is dispatched, so a failed write leaves nothing running
+            tasks_data = [
+                self._new_task_data(product_idea, research_depth, credits_needed, user_id)
+                for product_idea in product_ideas
+            ]
+            saved = await asyncio.gather(*(task_repository.create(task_data) for task_data in tasks_data))
+            if not all(saved):
+                await asyncio.gather(*(
+                    task_repository.delete(task_data["request_id"])
+                    for task_data, was_saved in zip(tasks_data, saved) if was_saved
+                ))
+                raise RuntimeError("Failed to save research tasks; no research was submitted")
             
-            return {
-                "request_id": request_id,
-                "status": "submitted",
-                "message": "Research task submitted successfully"
-            }
+            # Each idea becomes its own Celery task, so workers run the batch in parallel;
+            # a failed dispatch is reported for its idea and does not hide the ones that went through
+            results = []
+            for task_data in tasks_data:
+                try:
+                    results.append(self._dispatch(task_data))
+                except Exception as e:
+                    logger.error(f"Error dispatching research task {task_data['request_id']}: {e}")
+                    await task_repository.update(task_data["request_id"], {"status": "failed", "error": str(e)})
+                    results.append({
+                        "request_id": task_data["request_id"],
+                        "status": "failed",
+                        "message": f"Failed to submit research task: {e}"
+                    })
+            return results
             
         except Exception as e:
-            logger.error(f"Error submitting research request: {e}")
+            logger.error(f"Error submitting research batch: {e}")
             raise
     
+    async def _create_and_dispatch(
+        self,
+        product_idea: str,
+        research_depth: str,
+        credits_needed: int,
+        user_id: str
+    ) -> Dict[str, Any]:
+        """Save a pending task and hand it to a Celery worker"""
+        task_data = self._new_task_data(product_idea, research_depth, credits_needed, user_id)
+        
+        # Save task to repository
+        await task_repository.create(task_data)
+        
+        # Note: MongoDB text index will automatically index the task data
+        # No need for separate indexing service
+        
+        return self._dispatch(task_data)
+    
+    def _new_task_data(
+        self,
+        product_idea: str,
+        research_depth: str,
+        credits_needed: int,
+        user_id: str
+    ) -> Dict[str, Any]:
+        """Pending task document for a new research request"""
+        # Generate request ID
+        request_id = self._generate_request_id(product_idea)
+        
+        # Create task data
+        return {
+            "request_id": request_id,
+            "product_idea": product_idea,
+            "research_depth": research_depth,
+            "max_sources": 20,
+            "status": "pending",
+            "credits_required": credits_needed,
+            "user_id": user_id,
+            "started_at": datetime.now().isoformat(),
+            "created_at": datetime.now().isoformat(),
+            "completed_checkpoints": []  # Initialize as empty array
+        }
+    
+    def _dispatch(self, task_data: Dict[str, Any]) -> Dict[str, Any]:
+        """Submit a saved task to a Celery worker"""
+        process_research_task.delay(
+            request_id=task_data["request_id"],
+            product_idea=task_data["product_idea"],
+            research_depth=task_data["research_depth"]
+        )
+        
+        return {
+            "request_id": task_data["request_id"],
+            "status": "submitted",
+            "message": "Research task submitted successfully"
+        }
+    
     async def get_research_status(self, request_id: str) -> Dict[str, Any]:
         """Get research status with business logic"""
         try:
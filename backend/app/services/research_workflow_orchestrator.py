@@ -5,7 +5,7 @@ from typing import Dict, Any
 from datetime import datetime
 import asyncio
 
-from app.core.langgraph import ResearchSupervisor
+from app.core.langgraph.supervisor import _get_supervisor
 from app.repositories.task_repository import task_repository
 from app.services.credit_service import credit_service
 from app.services.progress_tracker import progress_tracker
@@ -19,9 +19,9 @@ MAX_SOURCES = 20
 class ResearchWorkflowOrchestrator:
 
     def __init__(self):
-        from app.core.config import settings
-        self.openai_api_key = settings.openai_api_key
-        self.tavily_api_key = settings.tavily_api_key
+        from app.core.config import get_settings
+        self.openai_api_key = get_settings().openai_api_key
+        self.tavily_api_key = get_settings().tavily_api_key
         self.orchestrator = None
     
     def _ensure_orchestrator_initialized(self):
@@ -31,7 +31,7 @@ class ResearchWorkflowOrchestrator:
             if not self.tavily_api_key:
                 raise ValueError("TAVILY_API_KEY environment variable is required")
             
-            self.orchestrator = ResearchSupervisor(
+            self.orchestrator = _get_supervisor(
                 self.openai_api_key,
                 self.tavily_api_key
             )
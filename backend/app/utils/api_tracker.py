@@ -1,76 +1,162 @@
+import asyncio
 import logging
+import weakref
+from functools import lru_cache
 from typing import Dict, Any, List
 
+import httpx
+
 logger = logging.getLogger(__name__)
 
+TAVILY_SEARCH_URL = "https://api.tavily.com/search"
+TAVILY_EXTRACT_URL = "https://api.tavily.com/extract"
+
+# One pooled async HTTP client per event loop (Celery workers may run several loops over their lifetime)
+_async_clients: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, httpx.AsyncClient]" = weakref.WeakKeyDictionary()
+
+def _get_async_http_client() -> httpx.AsyncClient:
+    """Get the shared httpx.AsyncClient bound to the running event loop"""
+    loop = asyncio.get_running_loop()
+    client = _async_clients.get(loop)
+    if client is None or client.is_closed:
+        client = httpx.AsyncClient(
+            headers={"Content-Type": "application/json"},
+            limits=httpx.Limits(max_keepalive_connections=20)
+        )
+        _async_clients[loop] = client
+    return client
+
+@lru_cache(maxsize=1)
+def _get_sync_http_client() -> httpx.Client:
+    """Get the process-wide pooled httpx.Client for sync calls"""
+    return httpx.Client(
+        headers={"Content-Type": "application/json"},
+        limits=httpx.Limits(max_keepalive_connections=16)
+    )
+
+@lru_cache(maxsize=1)
+def _get_mock_client():
+    """Get the shared mock Tavily client"""
+    from app.mocks.tavily_mock import MockTavilyClient
+    return MockTavilyClient(api_key="mock_key")
+
+def _use_mock() -> bool:
+    """Check if mocks should be used based on environment"""
+    from app.core.config import get_settings
+    
+    # Use mocks if environment=development
+    return get_settings().environment.lower() == 'development'
+
 class SimpleTavilyClient:
+    """Lightweight per-request handle; HTTP connections are pooled at module level"""
+    
+    __slots__ = ("request_id", "api_key")
+    
     def __init__(self, request_id: str, api_key: str = None):
         self.request_id = request_id
         self.api_key = api_key or self._get_api_key()
-        self._mock_client = None
-        self._should_use_mock = self._check_mock_mode()
     
     def _get_api_key(self) -> str:
         """Get Tavily API key from environment"""
-        from app.core.config import settings
-        return settings.tavily_api_key
+        from app.core.config import get_settings
+        return get_settings().tavily_api_key
     
-    def _check_mock_mode(self) -> bool:
-        """Check if mocks should be used based on environment"""
-        from app.core.config import settings
+    def _mock_search(self, query: str, search_depth: str, max_results: int) -> Dict[str, Any]:
+        logger.info(f"[{self.request_id}] Using MOCK Tavily Search API for query: '{query}'")
+        mock_client = _get_mock_client()
+        result = mock_client.search(query, search_depth, max_results)
+        logger.info(f"[{self.request_id}] Mock Tavily Search API returned {len(result.get('results', []))} results")
+        return result
+    
+    def _mock_extract(self, urls: List[str]) -> Dict[str, Any]:
+        logger.info(f"[{self.request_id}] Using MOCK Tavily Extract API for {len(urls)} URLs")
+        # Generate mock extract results
+        mock_results = []
+        for i, url in enumerate(urls):
+            mock_results.append({
+                "url": url,
+                "content": f"Mock extracted content from {url}. This is simulated content for testing purposes. Content includes relevant information about the topic with detailed analysis and insights.",
+                "title": f"Mock Article {i+1}",
+                "score": 0.8 + (i * 0.05)
+            })
         
-        # Use mocks if environment=development
-        return settings.environment.lower() == 'development'
+        result = {"results": mock_results}
+        logger.info(f"[{self.request_id}] Mock Tavily Extract API returned {len(result.get('results', []))} results")
+        return result
     
-    def _get_mock_client(self):
-        """Get mock Tavily client"""
-        if self._mock_client is None:
-            from app.mocks.tavily_mock import MockTavilyClient
-            self._mock_client = MockTavilyClient(api_key="mock_key")
-        return self._mock_client
+    def _build_search_payload(self, query: str, search_depth: str) -> Dict[str, Any]:
+        payload = {
+            "api_key": self.api_key,
+            "query": query,
+            "search_depth": search_depth,
+            "max_results": 20
+        }
+        
+        logger.info(f"[{self.request_id}] Making real Tavily Search API call with query: '{query}'")
+        
+        # Log payload without exposing API key
+        safe_payload = payload.copy()
+        safe_payload["api_key"] = "***MASKED***"
+        logger.info(f"[{self.request_id}] Tavily Search API payload: {safe_payload}")
+        return payload
     
-    def search(self, query: str, search_depth: str = "basic", max_results: int = 10, 
+    def _build_extract_payload(self, urls: List[str], extract_depth: str) -> Dict[str, Any]:
+        payload = {
+            "api_key": self.api_key,
+            "urls": urls,
+            "extract_depth": extract_depth,
+            "timeout": 60
+        }
+        
+        logger.info(f"[{self.request_id}] Making real Tavily Extract API call for {len(urls)} URLs with timeout=60s")
+        
+        # Log payload without exposing API key
+        safe_payload = payload.copy()
+        safe_payload["api_key"] = "***MASKED***"
+        logger.info(f"[{self.request_id}] Tavily Extract API payload: {safe_payload}")
+        return payload
+    
+    def search(self, query: str, search_depth: str = "basic", max_results: int = 10,
                include_answer: bool = True, include_raw_content: bool = False) -> Dict[str, Any]:
         
         # Use mock if enabled
-        if self._should_use_mock:
-            logger.info(f"[{self.request_id}] Using MOCK Tavily Search API for query: '{query}'")
-            mock_client = self._get_mock_client()
-            result = mock_client.search(query, search_depth, max_results)
-            logger.info(f"[{self.request_id}] Mock Tavily Search API returned {len(result.get('results', []))} results")
-            return result
+        if _use_mock():
+            return self._mock_search(query, search_depth, max_results)
         
         # Use real API
         try:
-            import requests
-            
-            url = "https://api.tavily.com/search"
-            headers = {
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "api_key": self.api_key,
-                "query": query,
-                "search_depth": search_depth,
-                "max_results": 20
-            }
-            
-            logger.info(f"[{self.request_id}] Making real Tavily Search API call with query: '{query}'")
+            payload = self._build_search_payload(query, search_depth)
+            response = _get_sync_http_client().post(TAVILY_SEARCH_URL, json=payload, timeout=30)
+            response.raise_for_status()
             
-            # Log payload without exposing API key
-            safe_payload = payload.copy()
-            safe_payload["api_key"] = "***MASKED***"
-            logger.info(f"[{self.request_id}] Tavily Search API payload: {safe_payload}")
+            result = response.json()
+            logger.info(f"[{self.request_id}] Tavily Search API returned {len(result.get('results', []))} results")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=30)
+            return result
+        
+        except Exception as e:
+            logger.error(f"[{self.request_id}] Tavily API call failed: {e}")
+            raise Exception(f"Tavily search API failed: {str(e)}")
+    
+    async def asearch(self, query: str, search_depth: str = "basic", max_results: int = 10,
+                      include_answer: bool = True, include_raw_content: bool = False) -> Dict[str, Any]:
+        """Async version of search - does not block the event loop"""
+        
+        # Use mock if enabled
+        if _use_mock():
+            return self._mock_search(query, search_depth, max_results)
+        
+        # Use real API
+        try:
+            payload = self._build_search_payload(query, search_depth)
+            response = await _get_async_http_client().post(TAVILY_SEARCH_URL, json=payload, timeout=30)
             response.raise_for_status()
             
             result = response.json()
             logger.info(f"[{self.request_id}] Tavily Search API returned {len(result.get('results', []))} results")
             
             return result
-            
+        
         except Exception as e:
             logger.error(f"[{self.request_id}] Tavily API call failed: {e}")
             raise Exception(f"Tavily search API failed: {str(e)}")
@@ -78,54 +164,42 @@ class SimpleTavilyClient:
     def extract(self, urls: List[str], extract_depth: str = "basic") -> Dict[str, Any]:
         
         # Use mock if enabled
-        if self._should_use_mock:
-            logger.info(f"[{self.request_id}] Using MOCK Tavily Extract API for {len(urls)} URLs")
-            mock_client = self._get_mock_client()
-            # Generate mock extract results
-            mock_results = []
-            for i, url in enumerate(urls):
-                mock_results.append({
-                    "url": url,
-                    "content": f"Mock extracted content from {url}. This is simulated content for testing purposes. Content includes relevant information about the topic with detailed analysis and insights.",
-                    "title": f"Mock Article {i+1}",
-                    "score": 0.8 + (i * 0.05)
-                })
-            
-            result = {"results": mock_results}
-            logger.info(f"[{self.request_id}] Mock Tavily Extract API returned {len(result.get('results', []))} results")
-            return result
+        if _use_mock():
+            return self._mock_extract(urls)
         
         # Use real API
         try:
-            import requests
-            
-            url = "https://api.tavily.com/extract"
-            headers = {
-                "Content-Type": "application/json"
-            }
-            
-            payload = {
-                "api_key": self.api_key,
-                "urls": urls,
-                "extract_depth": extract_depth,
-                "timeout": 60
-            }
-            
-            logger.info(f"[{self.request_id}] Making real Tavily Extract API call for {len(urls)} URLs with timeout=60s")
+            payload = self._build_extract_payload(urls, extract_depth)
+            response = _get_sync_http_client().post(TAVILY_EXTRACT_URL, json=payload, timeout=60)
+            response.raise_for_status()
             
-            # Log payload without exposing API key
-            safe_payload = payload.copy()
-            safe_payload["api_key"] = "***MASKED***"
-            logger.info(f"[{self.request_id}] Tavily Extract API payload: {safe_payload}")
+            result = response.json()
+            logger.info(f"[{self.request_id}] Tavily Extract API returned {len(result.get('results', []))} results")
             
-            response = requests.post(url, json=payload, headers=headers, timeout=60)
+            return result
+        
+        except Exception as e:
+            logger.error(f"[{self.request_id}] Tavily extract API call failed: {e}")
+            raise Exception(f"Tavily extract API failed: {str(e)}")
+    
+    async def aextract(self, urls: List[str], extract_depth: str = "basic") -> Dict[str, Any]:
+        """Async version of extract - does not block the event loop"""
+        
+        # Use mock if enabled
+        if _use_mock():
+            return self._mock_extract(urls)
+        
+        # Use real API
+        try:
+            payload = self._build_extract_payload(urls, extract_depth)
+            response = await _get_async_http_client().post(TAVILY_EXTRACT_URL, json=payload, timeout=60)
             response.raise_for_status()
             
             result = response.json()
             logger.info(f"[{self.request_id}] Tavily Extract API returned {len(result.get('results', []))} results")
             
             return result
-            
+        
         except Exception as e:
             logger.error(f"[{self.request_id}] Tavily extract API call failed: {e}")
             raise Exception(f"Tavily extract API failed: {str(e)}")
@@ -1,6 +1,6 @@
 from celery import Celery
-from celery.signals import worker_ready
-from app.core.config import settings, get_logger
+from celery.signals import worker_ready, worker_process_shutdown
+from app.core.config import get_settings, get_logger, stop_queue_listener
 
 logger = get_logger(__name__)
 
@@ -8,12 +8,12 @@ logger = get_logger(__name__)
 def get_sync_postgres_url():
     """Convert async PostgreSQL URL to sync URL for Celery"""
     from app.db.postgres_manager import convert_async_to_sync_url
-    return convert_async_to_sync_url(settings.postgres_url)
+    return convert_async_to_sync_url(get_settings().postgres_url)
 
 # Use centralized configuration for broker and results backend
 celery_app = Celery(
     'research_worker',
-    broker=settings.redis_url,  # Use Redis for broker
+    broker=get_settings().redis_url,  # Use Redis for broker
     backend=f"database+{get_sync_postgres_url()}",  # Use sync PostgreSQL for result backend
     include=['app.worker.tasks']
 )
@@ -33,7 +33,7 @@ celery_app.conf.update(
     result_expires=3600,  # Results expire after 1 hour
     result_persistent=True,  # Persist results to PostgreSQL
     # Logging configuration - disable Celery's stdout logging
-    worker_log_file=settings.celery_log_file,
+    worker_log_file=get_settings().celery_log_file,
     worker_log_level='INFO',
     worker_hijack_root_logger=False,  # Don't hijack root logger
     worker_log_color=False,  # Disable colored output
@@ -52,7 +52,7 @@ def initialize_services(sender=None, **kwargs):
         with celery_context():
             # Initialize PostgreSQL
             postgres_manager = database_factory.get_postgres_manager()
-            postgres_manager.connect_sync(settings.postgres_url)  # Actually connect with URL
+            postgres_manager.connect_sync(get_settings().postgres_url)  # Actually connect with URL
             if postgres_manager.is_connected:
                 logger.info("✅ PostgreSQL connected")
             else:
@@ -61,7 +61,7 @@ def initialize_services(sender=None, **kwargs):
             
             # Initialize MongoDB
             mongodb_manager = database_factory.get_mongodb_manager()
-            mongodb_manager.connect_sync(settings.mongodb_url)  # Actually connect with URL
+            mongodb_manager.connect_sync(get_settings().mongodb_url)  # Actually connect with URL
             if mongodb_manager.is_connected:
                 logger.info("✅ MongoDB connected")
             else:
@@ -70,7 +70,7 @@ def initialize_services(sender=None, **kwargs):
             
             # Initialize Redis
             redis_manager = database_factory.get_redis_manager()
-            redis_manager.connect_sync(settings.redis_url)  # Actually connect with URL
+            redis_manager.connect_sync(get_settings().redis_url)  # Actually connect with URL
             if redis_manager.is_connected:
                 logger.info("✅ Redis connected")
             else:
@@ -86,3 +86,17 @@ def initialize_services(sender=None, **kwargs):
     except Exception as e:
         logger.error(f"❌ Failed to initialize Celery services: {e}")
         raise  # Re-raise to prevent Celery from starting with broken services
+
+@worker_process_shutdown.connect
+def close_event_loop(sender=None, **kwargs):
+    """Close the persistent research event loop when a worker process exits"""
+    try:
+        from app.core.langgraph.supervisor import close_worker_loop
+        close_worker_loop()
+    except Exception as e:
+        logger.warning(f"Failed to close worker event loop: {e}")
+
+@worker_process_shutdown.connect
+def flush_logs(sender=None, **kwargs):
+    """Write out queued log records; pool processes exit without running atexit handlers"""
+    stop_queue_listener()
@@ -3,7 +3,7 @@ import logging
 from app.worker.celery_app import celery_app
 from app.services.research_workflow_orchestrator import research_workflow_orchestrator
 from app.db.database_factory import database_factory, celery_context
-from app.core.config import get_logger, settings
+from app.core.config import get_logger, get_settings
 
 logger = get_logger(__name__)
 
@@ -16,15 +16,15 @@ def initialize_worker_services():
         
         # Initialize MongoDB (sync)
         mongodb_manager = database_factory.get_mongodb_manager()
-        mongodb_manager.connect_sync(settings.mongodb_url)
+        mongodb_manager.connect_sync(get_settings().mongodb_url)
         
         # Initialize PostgreSQL (sync)
         postgres_manager = database_factory.get_postgres_manager()
-        postgres_manager.connect_sync(settings.postgres_url)
+        postgres_manager.connect_sync(get_settings().postgres_url)
         
         # Initialize Redis (sync) - for Celery operations
         redis_manager = database_factory.get_redis_manager()
-        redis_manager.connect_sync(settings.redis_url)
+        redis_manager.connect_sync(get_settings().redis_url)
         
         logger.info("Worker services initialized successfully (sync)")
         return True
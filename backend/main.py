@@ -7,7 +7,7 @@ from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.responses import JSONResponse
 
-from app.core.config import get_logger, settings
+from app.core.config import get_logger, get_settings
 from app.services.application_manager import application_manager
 from app.routes.research_routes import router as research_router
 
@@ -85,8 +85,8 @@ if __name__ == "__main__":
     
     uvicorn.run(
         "app:app",
-        host=settings.api_host,
-        port=settings.port,
+        host=get_settings().api_host,
+        port=get_settings().port,
         reload=True,
         log_config=None  # Use logging from config.py
     )